@@ -1,13 +1,25 @@
+import time
+_STARTED = time.perf_counter()  # Start-up time is reported once the window is up
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
-import requests
+import json
 import threading
-from github import Github, GithubException
-import base64
+import queue
+import itertools
+import traceback
+import codecs
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from github_core import (
+    GithubCore, TaskCancelled, TreeItem, SubstringIndex, looks_binary, format_size, make_operation_logger,
+    token_fingerprint, submit_in_context, blob_store, response_cache, rate_governor, request_metrics,
+    TOKEN_FILE, LOG_FILE, CACHE_DIR, BINARY_SNIFF_BYTES, RATE_LIMIT_RESERVE, UI_STALL_MS, PREFETCH_MAX_FILES,
+)
 
 # --- Constants ---
-TOKEN_FILE = "github_token.txt"
 COMMON_LICENSES = {
     "None": "",
     "MIT License": "mit",
@@ -16,6 +28,158 @@ COMMON_LICENSES = {
     "BSD 3-Clause License": "bsd-3-clause",
     "Unlicense": "unlicense",
 }
+BATCH_WORKERS, MAX_BATCH_WORKERS = 4, 16  # Repositories processed at once by the batch runner
+BATCH_ACTIONS = {"Download as .zip": "download", "Mirror to folder": "mirror", "Delete repository": "delete"}
+EDITOR_PAGE_BYTES = 256 * 1024  # File bytes inserted into the editor per event-loop turn
+SCHEDULER_WORKERS = 4      # Threads shared by every background action
+UI_POLL_MS = 30            # How often the Tk loop drains callbacks posted by workers
+INTERACTIVE_MAX_WAIT = 10  # Longest rate-limit pause an interactive task sits out before failing, in seconds
+PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BULK, PRIORITY_BACKGROUND = 0, 1, 2, 3
+TREE_INSERT_CHUNK = 300   # Browser rows inserted per Tk event-loop turn
+ROW_DIFF_MAX = 500        # Row edits applied one at a time before a list is redrawn whole
+LOG_MAX_LINES = 2000      # Lines kept in the log widget
+LOG_FLUSH_MS = 100        # Log widget refresh interval
+LAG_PROBE_MS = 100        # Interval of the event-loop lag probe
+STALL_LOG_INTERVAL = 1.0  # Seconds between "UI stalled" log lines
+PREFETCH_IDLE_MS = 1500   # Quiet time after navigating before likely-next files are prefetched
+RECENT_FILES_MAX = 20     # Recently opened files remembered per repository, for prefetching
+SESSION_CACHE = os.path.join(CACHE_DIR, "session.json")  # User, repository and directory shown at the last exit
+
+
+def row_changes(old, new):
+    """Row edits that turn the list old into new, or None when redrawing it whole is simpler.
+
+    Returns (indexes to delete, highest first; (index, value) pairs to insert,
+    lowest first). Edits only work when the rows both lists share are in the
+    same relative order.
+    """
+    old_set, new_set = set(old), set(new)
+    if [x for x in old if x in new_set] != [x for x in new if x in old_set]:
+        return None
+    deletes = [i for i in range(len(old) - 1, -1, -1) if old[i] not in new_set]
+    inserts = [(i, x) for i, x in enumerate(new) if x not in old_set]
+    if len(deletes) + len(inserts) > ROW_DIFF_MAX:
+        return None
+    return deletes, inserts
+
+
+def spool_remover(path, users):
+    """A callable that deletes path on its users-th call, for a temporary file read from several threads."""
+    lock, left = threading.Lock(), [users]
+
+    def release():
+        with lock:
+            left[0] -= 1
+            if left[0]:
+                return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return release
+
+
+class Task:
+    _ids = itertools.count(1)
+
+    def __init__(self, func, args, kwargs, priority):
+        self.id = next(Task._ids)  # Operation ID tagged onto structured log records
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class TaskScheduler:
+    """Fixed pool of worker threads running tasks in priority order.
+
+    Workers never touch Tk: callbacks for the UI are post()ed to a queue and
+    run by drain() on the Tk thread.
+    """
+
+    def __init__(self, workers, on_finished=None):
+        self.on_finished = on_finished
+        self._tasks = queue.PriorityQueue()
+        self._ui_calls = queue.Queue()
+        self._order = itertools.count()  # Keeps FIFO order within a priority
+        self._unfinished = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"worker-{i}", daemon=True).start()
+
+    def submit(self, func, *args, priority=PRIORITY_NORMAL, **kwargs):
+        task = Task(func, args, kwargs, priority)
+        with self._lock:
+            self._unfinished.add(task)
+        self._tasks.put((priority, next(self._order), task))
+        return task
+
+    def post(self, func, *args):
+        """Queue func(*args) to run on the Tk thread; safe from any thread."""
+        self._ui_calls.put((func, args))
+
+    def drain(self):
+        while True:
+            try:
+                func, args = self._ui_calls.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                func(*args)
+            except Exception:
+                traceback.print_exc()  # One broken callback must not hold back the ones queued after it
+
+    def unfinished(self, max_priority=PRIORITY_BULK):
+        with self._lock:
+            return [t for t in self._unfinished if t.priority <= max_priority]
+
+    def cancel(self, min_priority=PRIORITY_INTERACTIVE):
+        for task in self.unfinished():
+            if task.priority >= min_priority:
+                task.cancel()
+
+    def current(self):
+        """The task running on the calling thread, if any."""
+        return getattr(self._local, "task", None)
+
+    def run_as(self, task, func, *args, **kwargs):
+        """Run func on the calling thread on behalf of task, so its cancellation checks apply."""
+        previous = self.current()
+        self._local.task = task
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._local.task = previous
+
+    def check_cancelled(self):
+        """Raise TaskCancelled if the task running on this thread has been cancelled."""
+        task = self.current()
+        if task is not None and task.cancelled.is_set():
+            raise TaskCancelled()
+
+    def _work(self):
+        while True:
+            _, _, task = self._tasks.get()
+            self._local.task = task
+            try:
+                if not task.cancelled.is_set():
+                    task.func(*task.args, **task.kwargs)
+            except TaskCancelled:
+                pass
+            except Exception:
+                traceback.print_exc()  # Task functions log expected failures themselves
+            finally:
+                self._local.task = None
+                with self._lock:
+                    self._unfinished.discard(task)
+                if self.on_finished:
+                    self.post(self.on_finished, task)
+
 
 class GithubApp(tk.Tk):
     def __init__(self):
@@ -23,13 +187,44 @@ class GithubApp(tk.Tk):
         self.title("GitHub Repository Manager")
         self.geometry("1200x800")
 
-        self.github_api = None
-        self.user = None
         self.current_repo_browser_path = ""
+        self.scheduler = TaskScheduler(SCHEDULER_WORKERS, on_finished=self._on_task_finished)
+        self.core = GithubCore(log=self._log, progress=self._set_progress,
+                               check_cancelled=self.scheduler.check_cancelled)
+        self._tree_fill_generation = 0
+        self._tree_shown = None           # (repo, path) the browser rows fully show, for row-level updates
+        self._tree_rows = {}              # Path -> values of every browser row
+        self.repo_names = []              # Every known repository, sorted
+        self._shown_repo_names = []       # Rows of the repository listbox
+        self._repo_index = SubstringIndex([])
+        self._repo_filter = ("", None)    # Last query and the index positions it matched
+        self._logged_cache_stats = (0, 0)
+        self._logged_connections = 0
+        self._logged_pause = 0.0
+        self._progress_local = threading.local()  # Lets a batch item route progress into its own row
+        self._resume_path = None  # (repo, path) restored from the last session, refreshed after login
+        self._recent_files = {}   # Repo -> paths opened in it, most recent first
+        self._prefetch_timer = None
+        self._prefetch_task = None
+        self._goto_paths = []     # Paths behind the rows of the "Go to file" results
+        self._finder_loading = None  # Repo whose path index a task is building
+        self._reveal_path = None  # Row to select once the directory being shown has it
+        self._stalls_since_log, self._last_stall_log = 0, 0.0
+        rate_governor.should_abort = self.scheduler.check_cancelled
+        rate_governor.max_wait = self._rate_limit_max_wait
+        rate_governor.on_change = lambda: self._ui(self._update_rate_limit_label)
+
+        self._log_queue = queue.Queue()
+        self.operation_log = make_operation_logger(LOG_FILE)
 
         self._create_widgets()
+        self._pump_ui_queue()
+        self._flush_log()
         self._load_token()
         self._update_ui_state()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after(0, self._report_startup)
+        self._probe_ui_lag()
 
     def _create_widgets(self):
         # --- Top Frame for Authentication ---
@@ -48,6 +243,9 @@ class GithubApp(tk.Tk):
         
         self.login_status_label = ttk.Label(top_frame, text="Not logged in.")
         self.login_status_label.grid(row=0, column=4, padx=10, sticky="w")
+
+        self.rate_limit_label = ttk.Label(top_frame, text="", foreground="gray")
+        self.rate_limit_label.grid(row=0, column=5, padx=10, sticky="w")
         top_frame.columnconfigure(1, weight=1)
 
         # --- Main Paned Window ---
@@ -58,9 +256,15 @@ class GithubApp(tk.Tk):
         repo_list_frame = ttk.Frame(main_pane, padding="5")
         
         ttk.Button(repo_list_frame, text="Refresh Repositories", command=self._list_repos).pack(fill=tk.X, pady=5)
+
+        self.repo_filter_var = tk.StringVar()
+        self.repo_filter_var.trace_add("write", lambda *_: self._apply_repo_filter())
+        ttk.Entry(repo_list_frame, textvariable=self.repo_filter_var).pack(fill=tk.X, pady=(0, 5))
         
         repo_scrollbar_y = ttk.Scrollbar(repo_list_frame, orient=tk.VERTICAL)
-        self.repo_listbox = tk.Listbox(repo_list_frame, yscrollcommand=repo_scrollbar_y.set)
+        # exportselection=False keeps the selected repo when text is selected in the filter box
+        self.repo_listbox = tk.Listbox(repo_list_frame, yscrollcommand=repo_scrollbar_y.set, exportselection=False,
+                                       selectmode=tk.EXTENDED)
         repo_scrollbar_y.config(command=self.repo_listbox.yview)
         
         self.repo_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -70,8 +274,9 @@ class GithubApp(tk.Tk):
         main_pane.add(repo_list_frame, weight=1)
 
         # --- Right Pane: Notebook with Actions ---
-        notebook = ttk.Notebook(main_pane)
+        notebook = self.notebook = ttk.Notebook(main_pane)
         main_pane.add(notebook, weight=3)
+        notebook.bind("<<NotebookTabChanged>>", lambda e: self._refresh_metrics())
         
         # Tab 1: Repo Browser (NEW)
         self._create_repo_browser_tab(notebook)
@@ -81,7 +286,23 @@ class GithubApp(tk.Tk):
         
         # Tab 3: Create Repo
         self._create_new_repo_tab(notebook)
+
+        # Tab 4: Batch operations over the multi-selection
+        self._create_batch_tab(notebook)
+
+        # Tab 5: Request metrics per operation
+        self._create_metrics_tab(notebook)
         
+        # --- Progress Bar for long-running transfers ---
+        progress_frame = ttk.Frame(self, padding=(10, 0))
+        progress_frame.pack(fill=tk.X)
+        self.progress_bar = ttk.Progressbar(progress_frame, mode="determinate", maximum=1.0)
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_button = ttk.Button(progress_frame, text="Cancel", command=self._cancel_bulk_tasks)
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+        self.progress_label = ttk.Label(progress_frame, text="", width=50, anchor="e")
+        self.progress_label.pack(side=tk.RIGHT, padx=5)
+
         # --- Bottom Frame for Logging ---
         log_frame = ttk.Frame(self, padding="10")
         log_frame.pack(fill=tk.BOTH, expand=True)
@@ -111,6 +332,23 @@ class GithubApp(tk.Tk):
         self.browser_path_label = ttk.Label(browser_controls_frame, text="Current Path: /", anchor="w")
         self.browser_path_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
 
+        # Go to file: fuzzy search over every path of the repository; results show only while typing
+        self.goto_frame = ttk.Frame(browser_tab)
+        self.goto_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(self.goto_frame, text="Go to file (Ctrl+P):").pack(side=tk.LEFT, padx=5)
+        self.goto_var = tk.StringVar()
+        self.goto_var.trace_add("write", lambda *_: self._apply_goto_filter())
+        self.goto_entry = ttk.Entry(self.goto_frame, textvariable=self.goto_var)
+        self.goto_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.goto_entry.bind("<Return>", lambda e: self._goto_selected_result())
+        self.goto_entry.bind("<Down>", lambda e: self._focus_goto_results())
+        self.goto_entry.bind("<Escape>", lambda e: self.goto_var.set(""))
+        self.goto_results = tk.Listbox(browser_tab, height=10, exportselection=False)
+        self.goto_results.bind("<Double-1>", lambda e: self._goto_selected_result())
+        self.goto_results.bind("<Return>", lambda e: self._goto_selected_result())
+        self.goto_results.bind("<Escape>", lambda e: (self.goto_var.set(""), self.goto_entry.focus_set()))
+        self.bind("<Control-p>", lambda e: self._focus_goto())
+
         # Main treeview
         tree_frame = ttk.Frame(browser_tab)
         tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
@@ -162,6 +400,8 @@ class GithubApp(tk.Tk):
         btn_frame.pack(fill=tk.X, pady=5)
         self.download_button = ttk.Button(btn_frame, text="Download as .zip", command=self._download_repo)
         self.download_button.pack(side=tk.LEFT, padx=5)
+        self.mirror_button = ttk.Button(btn_frame, text="Mirror to Folder...", command=self._mirror_repo)
+        self.mirror_button.pack(side=tk.LEFT, padx=5)
         self.delete_repo_button = ttk.Button(btn_frame, text="Delete Repository", command=self._delete_repo, style="danger.TButton")
         self.delete_repo_button.pack(side=tk.LEFT, padx=5)
         
@@ -179,6 +419,9 @@ class GithubApp(tk.Tk):
 
         self.upload_folder_button = ttk.Button(file_ops_frame, text="Upload Folder...", command=self._upload_folder)
         self.upload_folder_button.grid(row=2, column=1, sticky="ew", padx=2, pady=5)
+
+        self.sync_folder_button = ttk.Button(file_ops_frame, text="Sync Folder (mirror)...", command=self._sync_folder)
+        self.sync_folder_button.grid(row=3, column=0, columnspan=2, sticky="ew", padx=2, pady=5)
         
         file_ops_frame.columnconfigure(0, weight=1)
         file_ops_frame.columnconfigure(1, weight=1)
@@ -221,25 +464,88 @@ class GithubApp(tk.Tk):
 
         create_tab.columnconfigure(1, weight=1)
 
+    def _create_batch_tab(self, notebook):
+        batch_tab = ttk.Frame(notebook, padding="10")
+        notebook.add(batch_tab, text="Batch Operations")
+
+        controls = ttk.Frame(batch_tab)
+        controls.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(controls, text="Action:").pack(side=tk.LEFT)
+        self.batch_action = ttk.Combobox(controls, values=list(BATCH_ACTIONS), state="readonly", width=20)
+        self.batch_action.set("Download as .zip")
+        self.batch_action.pack(side=tk.LEFT, padx=5)
+        ttk.Label(controls, text="Concurrency:").pack(side=tk.LEFT, padx=(10, 0))
+        self.batch_workers = tk.IntVar(value=BATCH_WORKERS)
+        ttk.Spinbox(controls, from_=1, to=MAX_BATCH_WORKERS, textvariable=self.batch_workers, width=4).pack(side=tk.LEFT, padx=5)
+        self.batch_run_button = ttk.Button(controls, text="Run on Selected Repositories", command=self._run_batch)
+        self.batch_run_button.pack(side=tk.LEFT, padx=10)
+
+        self.batch_tree = ttk.Treeview(batch_tab, columns=("Status", "Detail"), show="tree headings")
+        self.batch_tree.heading("#0", text="Repository")
+        self.batch_tree.heading("Status", text="Status")
+        self.batch_tree.heading("Detail", text="Detail")
+        self.batch_tree.column("#0", width=220)
+        self.batch_tree.column("Status", width=90, anchor="w")
+        self.batch_tree.column("Detail", width=320, anchor="w")
+        batch_scroll = ttk.Scrollbar(batch_tab, orient=tk.VERTICAL, command=self.batch_tree.yview)
+        self.batch_tree.configure(yscrollcommand=batch_scroll.set)
+        self.batch_summary_label = ttk.Label(batch_tab, text="Select several repositories (Ctrl/Shift-click) to run an action on all of them.")
+        self.batch_summary_label.pack(side=tk.BOTTOM, anchor="w", pady=(5, 0))
+        self.batch_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        batch_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def _create_metrics_tab(self, notebook):
+        metrics_tab = self.metrics_tab = ttk.Frame(notebook, padding="10")
+        notebook.add(metrics_tab, text="Metrics")
+
+        controls = ttk.Frame(metrics_tab)
+        controls.pack(fill=tk.X, pady=(0, 5))
+        ttk.Button(controls, text="Refresh", command=self._refresh_metrics).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Export JSON...", command=lambda: self._export_metrics("json")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Export CSV...", command=lambda: self._export_metrics("csv")).pack(side=tk.LEFT, padx=5)
+        self.ui_lag_label = ttk.Label(controls, text="", foreground="gray")
+        self.ui_lag_label.pack(side=tk.RIGHT, padx=5)
+
+        columns = ("Requests", "Failed", "HTTP time", "Avg", "Down", "Up", "Cache hit/miss", "Rate cost", "Duration")
+        self.metrics_tree = ttk.Treeview(metrics_tab, columns=columns, show="tree headings")
+        self.metrics_tree.heading("#0", text="Operation / endpoint")
+        self.metrics_tree.column("#0", width=260)
+        for column in columns:
+            self.metrics_tree.heading(column, text=column)
+            self.metrics_tree.column(column, width=70, anchor="e")
+        metrics_scroll = ttk.Scrollbar(metrics_tab, orient=tk.VERTICAL, command=self.metrics_tree.yview)
+        self.metrics_tree.configure(yscrollcommand=metrics_scroll.set)
+        self.metrics_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        metrics_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
     # --- UI State Management ---
 
-    def _update_ui_state(self, busy=False):
-        """Enable/disable widgets based on login status and selection."""
-        is_logged_in = self.github_api is not None
-        is_repo_selected = bool(self.repo_listbox.curselection())
+    def _update_ui_state(self):
+        """Enable/disable widgets based on login status, selection and running tasks."""
+        # Bulk transfers run in the background and do not lock the rest of the UI
+        busy = bool(self.scheduler.unfinished(max_priority=PRIORITY_NORMAL))
+        is_logged_in = self.core.github_api is not None
+        selected_count = len(self.repo_listbox.curselection())
+        is_repo_selected = selected_count == 1  # Single-repository actions need exactly one
         
         # General state
         self.create_repo_button.config(state=tk.NORMAL if is_logged_in and not busy else tk.DISABLED)
+        self.batch_run_button.config(state=tk.NORMAL if is_logged_in and selected_count and not busy else tk.DISABLED)
         
         repo_action_state = tk.NORMAL if is_logged_in and is_repo_selected and not busy else tk.DISABLED
         self.download_button.config(state=repo_action_state)
+        self.mirror_button.config(state=repo_action_state)
         self.delete_repo_button.config(state=repo_action_state)
         self.upload_file_button.config(state=repo_action_state)
         self.upload_folder_button.config(state=repo_action_state)
+        self.sync_folder_button.config(state=repo_action_state)
         
         # Browser state
         self.browser_refresh_button.config(state=repo_action_state)
-        self.browser_up_button.config(state=tk.NORMAL if is_logged_in and is_repo_selected and self.current_repo_browser_path and not busy else tk.DISABLED)
+        # A downloaded archive can be browsed without logging in
+        can_browse = is_repo_selected and (is_logged_in or self._get_selected_repo_name() in self.core.tree_indexes)
+        self.browser_up_button.config(state=tk.NORMAL if can_browse and self.current_repo_browser_path and not busy else tk.DISABLED)
+        self.goto_entry.config(state=tk.NORMAL if can_browse else tk.DISABLED)
         
         # Browser selection-dependent state
         tree_selection = self.repo_tree.selection()
@@ -257,22 +563,34 @@ class GithubApp(tk.Tk):
         # Handle login button state
         self.login_button.config(state=tk.DISABLED if busy else tk.NORMAL)
         
+        has_bulk_tasks = any(t.priority == PRIORITY_BULK for t in self.scheduler.unfinished())
+        self.cancel_button.config(state=tk.NORMAL if has_bulk_tasks else tk.DISABLED)
+
         # Update cursor for busy state
         self.config(cursor="watch" if busy else "")
 
     def _on_repo_select(self, event=None):
         """Update UI when a repository is selected."""
+        self.goto_var.set("")  # Results belong to the previously selected repository
         if not self.repo_listbox.curselection():
             self.selected_repo_label.config(text="Select a repository from the list.")
-            # Clear browser
-            self.repo_tree.delete(*self.repo_tree.get_children())
+            self._clear_tree()
             self.browser_path_label.config(text="Current Path: /")
             self._update_ui_state()
             return
 
-        selected_index = self.repo_listbox.curselection()[0]
-        repo_name = self.repo_listbox.get(selected_index)
+        repo_name = self._get_selected_repo_name()
+        if repo_name is None:
+            count = len(self.repo_listbox.curselection())
+            self.selected_repo_label.config(text=f"Selected: {count} repositories (see Batch Operations)")
+            self._clear_tree()
+            self.browser_path_label.config(text="Current Path: /")
+            self._update_ui_state()
+            return
         self.selected_repo_label.config(text=f"Selected: {repo_name}")
+        if self.core.github_api is None and not self.core.has_snapshot(repo_name):
+            self._update_ui_state()
+            return  # Showing the cached list while login is still in progress
         
         # Load root of the selected repo in the browser tab
         self._browse_repo(path="")
@@ -293,32 +611,182 @@ class GithubApp(tk.Tk):
         elif item_type == 'File':
             self._browser_view_file()
 
-    # --- Core Logic in Threads ---
-
-    def _run_in_thread(self, target_func, *args, **kwargs):
-        """Helper to run a function in a new thread to avoid freezing the GUI."""
-        self._update_ui_state(busy=True)
-        # Pass both args and kwargs to the Thread constructor
-        thread = threading.Thread(target=target_func, args=args, kwargs=kwargs)
-        thread.daemon = True
-        thread.start()
-        self._check_thread(thread)
-
-    def _check_thread(self, thread):
-        """Check if the thread is alive and re-enable UI when it's done."""
-        if thread.is_alive():
-            self.after(100, lambda: self._check_thread(thread))
-        else:
-            self._update_ui_state(busy=False)
+    # --- Core Logic in Background Tasks ---
+
+    def _run_task(self, target_func, *args, priority=PRIORITY_NORMAL, **kwargs):
+        """Queue a function on the shared worker pool to avoid freezing the GUI."""
+        task = self.scheduler.submit(self._run_operation, target_func, *args, priority=priority, **kwargs)
+        self._update_ui_state()
+        return task
+
+    def _run_operation(self, func, *args, **kwargs):
+        """Run a task function as one metrics operation, named after it (e.g. "browse_repo")."""
+        name = func.__name__.strip("_")
+        name = name[:-len("_logic")] if name.endswith("_logic") else name
+        with request_metrics.operation(name) as op:
+            try:
+                func(*args, **kwargs)
+            finally:
+                if op.totals["requests"]:
+                    summary, task = f"📊 {name}: {op.summary()}.", self.scheduler.current()
+                    if task is not None and task.priority == PRIORITY_BACKGROUND:
+                        # Idle-time work (prefetch, revalidation) stays out of the GUI log
+                        self.operation_log.info(summary, extra={"op": task.id})
+                    else:
+                        self._log(summary)
+
+    def _rate_limit_max_wait(self):
+        """Interactive tasks keep the UI busy, so they fail rather than sit out a rate-limit reset."""
+        task = self.scheduler.current()
+        return INTERACTIVE_MAX_WAIT if task is not None and task.priority == PRIORITY_INTERACTIVE else None
+
+    def _ui(self, func, *args):
+        """Run func on the Tk thread; the only way worker code may touch widgets."""
+        self.scheduler.post(func, *args)
+
+    def _pump_ui_queue(self):
+        try:
+            self.scheduler.drain()
+        finally:
+            self.after(UI_POLL_MS, self._pump_ui_queue)
+
+    def _on_task_finished(self, task):
+        self._update_ui_state()
+        if task.priority != PRIORITY_BACKGROUND:
+            self._log_cache_stats()  # Background traffic is counted in the next foreground task's line
+        self._refresh_metrics()
+
+    def _cancel_bulk_tasks(self):
+        self.scheduler.cancel(min_priority=PRIORITY_BULK)
+        self._log("⏹️ Cancelling background transfers...")
+
+    def _log_cache_stats(self):
+        stats = (response_cache.hits, response_cache.misses)
+        if stats != self._logged_cache_stats:
+            self._logged_cache_stats = stats
+            hits, misses = stats
+            self._log(f"📦 HTTP cache: {hits} hits, {misses} misses ({hits * 100 // max(hits + misses, 1)}% served without rate-limit cost).")
+        # Logged only when new connections were opened, which stops once the pool is warm
+        opened, sent = self.core.connection_stats()
+        if opened != self._logged_connections:
+            self._log(f"🔌 {opened - self._logged_connections} new connection(s); {opened} opened for {sent} requests "
+                      f"({(sent - opened) * 100 // max(sent, 1)}% reused).")
+            self._logged_connections = opened
+
+    def _update_rate_limit_label(self):
+        governor = rate_governor
+        if governor.remaining is None:
+            return
+        if governor.paused_until > time.time():
+            resume = time.strftime("%H:%M:%S", time.localtime(governor.paused_until))
+            self.rate_limit_label.config(text=f"⏸️ Rate limited, paused until {resume}", foreground="orange")
+            if governor.paused_until != self._logged_pause:
+                self._logged_pause = governor.paused_until
+                self._log(f"⏸️ GitHub rate limit hit, pausing requests until {resume}.")
+                # Flip the label back once the pause is over
+                self.after(int((governor.paused_until - time.time()) * 1000) + 100, self._update_rate_limit_label)
+            return
+        reset = time.strftime("%H:%M", time.localtime(governor.reset_at))
+        low = governor.remaining < (governor.limit or 0) * RATE_LIMIT_RESERVE
+        self.rate_limit_label.config(text=f"API budget: {governor.remaining}/{governor.limit}, resets {reset}",
+                                     foreground="orange" if low else "gray")
+
+    def _probe_ui_lag(self, expected=None):
+        """Re-arm every LAG_PROBE_MS; arriving late means the event loop was blocked."""
+        now = time.perf_counter()
+        if expected is not None:
+            lag_ms = (now - expected) * 1000
+            if lag_ms > UI_STALL_MS:
+                request_metrics.record_ui_lag(lag_ms)
+                self._stalls_since_log += 1
+                if now - self._last_stall_log >= STALL_LOG_INTERVAL:
+                    self._log(f"🐢 UI event loop stalled for {lag_ms:.0f} ms ({self._stalls_since_log} stall(s) over {UI_STALL_MS} ms since the last report).")
+                    self._stalls_since_log, self._last_stall_log = 0, now
+        self.after(LAG_PROBE_MS, self._probe_ui_lag, now + LAG_PROBE_MS / 1000)
+
+    def _refresh_metrics(self):
+        """Redraw the metrics tab, only while it is the visible tab."""
+        if self.notebook.select() != str(self.metrics_tab):
+            return
+        open_rows = {self.metrics_tree.item(row, "text") for row in self.metrics_tree.get_children() if self.metrics_tree.item(row, "open")}
+        self.metrics_tree.delete(*self.metrics_tree.get_children())
+
+        def values(totals, duration=None):
+            requests = totals["requests"]
+            return (requests, totals["errors"], f"{totals['latency']:.2f}s",
+                    f"{totals['latency'] * 1000 / requests:.0f} ms" if requests else "",
+                    format_size(totals["received"]), format_size(totals["sent"]),
+                    f"{totals['cache_hits']}/{totals['cache_misses']}", totals["rate_cost"],
+                    f"{duration:.2f}s" if duration is not None else "")
+
+        for op in reversed(request_metrics.snapshot()):  # Newest first
+            label = f"#{op['id']} {op['name']}"
+            row = self.metrics_tree.insert("", tk.END, text=label, values=values(op, op["duration"]), open=label in open_rows)
+            for endpoint, totals in sorted(op["endpoints"].items(), key=lambda e: -e[1]["latency"]):
+                self.metrics_tree.insert(row, tk.END, text=endpoint, values=values(totals))
+        self.ui_lag_label.config(text=f"UI stalls over {UI_STALL_MS} ms: {request_metrics.ui_stalls} "
+                                      f"(worst {request_metrics.max_ui_lag_ms:.0f} ms)")
+
+    def _export_metrics(self, kind):
+        path = filedialog.asksaveasfilename(defaultextension=f".{kind}", initialfile=f"github_app_metrics.{kind}",
+                                            filetypes=[(kind.upper(), f"*.{kind}")])
+        if not path:
+            return
+        try:
+            (request_metrics.export_json if kind == "json" else request_metrics.export_csv)(path)
+            self._log(f"📊 Metrics exported to '{path}'.")
+        except OSError as e:
+            self._log(f"❌ Failed to export metrics: {e}")
 
     def _log(self, message):
-        """Thread-safe logging to the text widget."""
-        def append_log():
+        """Thread-safe logging; the widget is updated in batches by _flush_log."""
+        task = self.scheduler.current()
+        self.operation_log.info(message, extra={"op": task.id if task else None})
+        self._log_queue.put(message)
+
+    def _flush_log(self):
+        """Append queued messages in one insert and keep the widget to LOG_MAX_LINES lines."""
+        lines = []
+        while True:
+            try:
+                lines.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            at_bottom = self.log_text.yview()[1] >= 0.999
             self.log_text.config(state="normal")
-            self.log_text.insert(tk.END, message + "\n")
-            self.log_text.see(tk.END)
+            self.log_text.insert(tk.END, "\n".join(lines[-LOG_MAX_LINES:]) + "\n")
+            excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+            if excess > 0:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+            if at_bottom:  # Don't yank the view away from someone reading older lines
+                self.log_text.see(tk.END)
             self.log_text.config(state="disabled")
-        self.after(0, append_log)
+        self.after(LOG_FLUSH_MS, self._flush_log)
+
+    def _set_progress(self, text, fraction=None):
+        """Thread-safe progress update; fraction=None shows an indeterminate bar."""
+        report = getattr(self._progress_local, "report", None)
+        if report is not None:  # A batch item reports into its own row instead
+            report(text, fraction)
+            return
+        def update():
+            if fraction is None:
+                if str(self.progress_bar.cget("mode")) != "indeterminate":
+                    self.progress_bar.config(mode="indeterminate")
+                    self.progress_bar.start(50)
+            else:
+                self.progress_bar.stop()
+                self.progress_bar.config(mode="determinate", value=fraction)
+            self.progress_label.config(text=text)
+        self._ui(update)
+
+    def _clear_progress(self):
+        def clear():
+            self.progress_bar.stop()
+            self.progress_bar.config(mode="determinate", value=0)
+            self.progress_label.config(text="")
+        self._ui(clear)
 
     # --- Authentication and Repo Listing ---
     
@@ -328,11 +796,13 @@ class GithubApp(tk.Tk):
                 token = f.read().strip()
                 if token:
                     self.token_entry.insert(0, token)
+                    self._load_cached_repo_list(token)
+                    self._restore_session(token)
                     self._log(f"Loaded token from {TOKEN_FILE}.")
-                    self._run_in_thread(self._login_logic)
+                    self._login()  # Validates the token in the background
 
-    def _save_token(self, token):
-        if self.save_token_var.get():
+    def _save_token(self, token, save):
+        if save:
             with open(TOKEN_FILE, "w") as f:
                 f.write(token)
             self._log(f"Token saved to {TOKEN_FILE}.")
@@ -340,99 +810,443 @@ class GithubApp(tk.Tk):
              os.remove(TOKEN_FILE)
              self._log(f"Removed {TOKEN_FILE}.")
 
-    def _login(self): self._run_in_thread(self._login_logic)
-    def _list_repos(self): self._run_in_thread(self._list_repos_logic)
-
-    def _login_logic(self):
+    def _login(self):
         token = self.token_entry.get().strip()
         if not token:
             self._log("❌ Error: GitHub token cannot be empty.")
             return
+        self._run_task(self._login_logic, token, self.save_token_var.get(), priority=PRIORITY_INTERACTIVE)
+
+    def _list_repos(self): self._run_task(self._list_repos_logic, priority=PRIORITY_INTERACTIVE)
 
+    def _login_logic(self, token, save_token):
+        started = time.perf_counter()
         try:
-            self.github_api = Github(token)
-            self.user = self.github_api.get_user()
-            self.user.login # This call will fail if the token is invalid
-            self.after(0, lambda: self.login_status_label.config(text=f"Logged in as: {self.user.login}", foreground="green"))
-            self._log(f"✅ Successfully logged in as {self.user.login}.")
-            self._save_token(token)
-            self._run_in_thread(self._list_repos_logic) # Automatically list repos on login
+            login = self.core.login(token)
+            self._ui(lambda: self.login_status_label.config(text=f"Logged in as: {login}", foreground="green"))
+            self._log(f"✅ Successfully logged in as {login} (verified in {time.perf_counter() - started:.2f}s).")
+            self._ui(self._resume_session)
+            self._save_token(token, save_token)
+            self._list_repos_logic() # Automatically list repos on login
         except Exception as e:
-            self.github_api = None
-            self.user = None
-            self.after(0, lambda: self.login_status_label.config(text="Login failed.", foreground="red"))
+            self._ui(lambda: self.login_status_label.config(text="Login failed.", foreground="red"))
             self._log(f"❌ Login failed: {e}")
 
     def _list_repos_logic(self):
-        if not self.user:
+        if not self.core.user:
             self._log("❌ Error: Not logged in.")
             return
 
         self._log("🔄 Fetching repositories...")
-        repos = self.user.get_repos()
-        repo_names = sorted([repo.full_name for repo in repos])
-        
-        def update_listbox():
-            current_selection = self._get_selected_repo_name()
-            self.repo_listbox.delete(0, tk.END)
-            for name in repo_names:
-                self.repo_listbox.insert(tk.END, name)
-            if current_selection in repo_names:
-                idx = repo_names.index(current_selection)
+        try:
+            repo_names = self.core.list_repos(on_update=lambda names: self._ui(self._merge_repo_names, names))
+            self._ui(self._set_repo_names, repo_names)
+            self._log(f"✅ Found {len(repo_names)} repositories.")
+        except Exception as e:
+            self._log(f"❌ Failed to list repositories: {e}")
+
+    def _load_cached_repo_list(self, token):
+        """Show the last known repository list straight away; login revalidates it."""
+        repo_names = self.core.cached_repo_list(token)
+        if repo_names is not None:
+            self._set_repo_names(repo_names)
+            self._log(f"Showing {len(repo_names)} cached repositories while refreshing...")
+
+    def _set_repo_names(self, repo_names):
+        """Replace the known repositories (sorted) and redraw the filtered list."""
+        self.repo_names = repo_names
+        self._repo_index = SubstringIndex(repo_names)
+        self._repo_filter = ("", None)
+        self._apply_repo_filter()
+
+    def _merge_repo_names(self, repo_names):
+        """Add names from a partial listing; the known list only shrinks once the listing is complete."""
+        merged = sorted(set(self.repo_names).union(repo_names))
+        if merged != self.repo_names:
+            self._set_repo_names(merged)
+
+    def _apply_repo_filter(self):
+        query = self.repo_filter_var.get().strip()
+        previous_query, previous_matches = self._repo_filter
+        # Typing more characters can only narrow the result, so search within the last matches
+        within = previous_matches if previous_query and query.lower().startswith(previous_query.lower()) else None
+        matches = self._repo_index.search(query, within) if query else None
+        self._repo_filter = (query, matches)
+        names = self.repo_names if matches is None else [self._repo_index.strings[i] for i in matches]
+
+        current_selection = self._get_selected_repo_names()
+        self._show_repo_rows(names)
+        if len(self.repo_listbox.curselection()) != len(current_selection):
+            self._on_repo_select()
+
+    def _show_repo_rows(self, names):
+        """Make the listbox show names, touching only the rows that changed so selection and scrolling stay put."""
+        shown, self._shown_repo_names = self._shown_repo_names, names
+        changes = row_changes(shown, names)
+        if changes is not None:
+            deletes, inserts = changes
+            for idx in deletes:
+                self.repo_listbox.delete(idx)
+            for idx, name in inserts:
+                self.repo_listbox.insert(idx, name)
+            return
+
+        kept = set(self._get_selected_repo_names()).intersection(names)
+        self.repo_listbox.delete(0, tk.END)
+        if names:
+            self.repo_listbox.insert(tk.END, *names)
+        for idx, name in enumerate(names):
+            if name in kept:
                 self.repo_listbox.selection_set(idx)
-                self.repo_listbox.activate(idx)
+        if kept:
+            idx = names.index(min(kept))
+            self.repo_listbox.activate(idx)
+            self.repo_listbox.see(idx)
+
+    def _apply_repo_change(self, added=(), removed=()):
+        """Show repositories we just created or deleted without re-listing, then confirm in the background."""
+        self._set_repo_names(sorted(set(self.repo_names).union(added).difference(removed)))
+        self._run_task(self._revalidate_repos_logic, priority=PRIORITY_BACKGROUND)
+
+    def _revalidate_repos_logic(self):
+        # Unchanged pages come back as 304s, which cost no rate limit
+        try:
+            repo_names = self.core.list_repos()
+            self._ui(self._set_repo_names, repo_names)
+        except Exception as e:
+            self._log(f"⚠️ Could not refresh the repository list: {e}")
 
-            self._log(f"✅ Found {len(repo_names)} repositories.")
-            self._on_repo_select() 
-        
-        self.after(0, update_listbox)
-        
     def _get_selected_repo_name(self):
-        if not self.repo_listbox.curselection():
+        """The selected repository, or None unless exactly one is selected."""
+        selection = self.repo_listbox.curselection()
+        if len(selection) != 1:
             return None
-        return self.repo_listbox.get(self.repo_listbox.curselection()[0])
+        return self.repo_listbox.get(selection[0])
+
+    def _get_selected_repo_names(self):
+        return [self.repo_listbox.get(i) for i in self.repo_listbox.curselection()]
+
+    # --- Session Snapshot ---
+
+    def _report_startup(self):
+        self.update_idletasks()  # Make sure the window has actually been drawn
+        self._log(f"⏱️ Window ready {time.perf_counter() - _STARTED:.2f}s after start.")
+
+    def _restore_session(self, token):
+        """Show the user, repository and directory of the last run while the login is still in flight."""
+        try:
+            with open(SESSION_CACHE, encoding="utf-8") as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            return
+        if session.get("token") != token_fingerprint(token):
+            return
+        self.login_status_label.config(text=f"Logged in as: {session['user']} (verifying...)", foreground="gray")
+        self._recent_files = session.get("recent", {})
+
+        repo_name, path = session.get("repo"), session.get("path", "")
+        if repo_name not in self.repo_names:
+            return
+        idx = self.repo_names.index(repo_name)  # The filter box is still empty at start-up
+        self.repo_listbox.selection_set(idx)
+        self.repo_listbox.see(idx)
+        self.selected_repo_label.config(text=f"Selected: {repo_name}")
+        self.current_repo_browser_path = path
+        self._clear_tree()
+        self.browser_path_label.config(text=f"Current Path: /{path}")
+        self._insert_tree_rows([TreeItem(*item) for item in session.get("items", [])], 0,
+                               self._tree_fill_generation, (repo_name, path))
+        self._resume_path = (repo_name, path)
+
+    def _resume_session(self):
+        """Refresh whatever repository is selected now that the token is known to be valid."""
+        repo_name = self._get_selected_repo_name()
+        if repo_name:
+            resume_repo, resume_path = self._resume_path or (None, "")
+            self._browse_repo(path=resume_path if repo_name == resume_repo else "")
+        self._resume_path = None
+
+    def _save_session(self):
+        repo_name, path = self._get_selected_repo_name(), self.current_repo_browser_path
+        index = self.core.tree_indexes.get(repo_name)
+        session = {
+            "token": token_fingerprint(self.core.token),
+            "user": self.core.user.login,
+            "repo": repo_name,
+            "path": path,
+            "items": [list(item) for item in index.list_dir(path)] if index and index.is_dir(path) else [],
+            "recent": self._recent_files,
+        }
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(SESSION_CACHE + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(session, f)
+            os.replace(SESSION_CACHE + ".tmp", SESSION_CACHE)
+        except OSError:
+            pass  # Only costs a slower next start
+
+    def _on_close(self):
+        if self.core.user is not None:
+            self._save_session()
+        self.destroy()
 
     # --- Browser Tab Logic ---
 
-    def _browse_repo(self, path=""):
+    def _browse_repo(self, path="", refresh=False):
         repo_name = self._get_selected_repo_name()
         if not repo_name: return
-        self._run_in_thread(self._browse_repo_logic, repo_name, path)
+        index = self.core.tree_indexes.get(repo_name)
+        if index is not None and not refresh:
+            self._show_directory(repo_name, index, path)
+            return
+        self._run_task(self._browse_repo_logic, repo_name, path, priority=PRIORITY_INTERACTIVE)
 
     def _browse_repo_logic(self, repo_name, path):
         self._log(f"🔎 Browsing '{repo_name}' at path: '{path or '/'}'...")
         try:
-            repo = self.github_api.get_repo(repo_name)
-            contents = repo.get_contents(path)
-            
-            self.current_repo_browser_path = path
-            
-            # Sort directories first, then files, all alphabetically
-            sorted_contents = sorted(contents, key=lambda c: (c.type != 'dir', c.name.lower()))
-            
-            def update_tree():
-                self.repo_tree.delete(*self.repo_tree.get_children())
-                self.browser_path_label.config(text=f"Current Path: /{path}")
-                
-                for item in sorted_contents:
-                    item_type = "Directory" if item.type == 'dir' else "File"
-                    item_size = self._format_size(item.size) if item.type == 'file' else ""
-                    # The hidden path column holds the full path for later use
-                    self.repo_tree.insert("", "end", values=(item.name, item_type, item_size, item.path))
-                
-                self._log(f"✅ Loaded {len(sorted_contents)} items.")
-
-            self.after(0, update_tree)
+            index = self.core.load_tree_index(repo_name)
+        except Exception as e:
+            index = self.core.offline_tree_index(repo_name)
+            if index is None:
+                self._log(f"❌ Failed to browse repository contents: {e}")
+                return
+            self._log(f"📦 GitHub unavailable ({e}); browsing the downloaded archive at {index.commit_sha[:7]}.")
+        self._ui(self._show_directory, repo_name, index, path)
+
+    def _show_directory(self, repo_name, index, path, reveal=None):
+        """Fill the browser from the tree index; no network access. reveal is a row to select once it is shown."""
+        if repo_name != self._get_selected_repo_name():
+            return  # The selection changed while the index was loading
+        while path and not index.is_dir(path):
+            path = os.path.dirname(path)  # e.g. the directory was deleted since
+        self.current_repo_browser_path = path
+        self._reveal_path = reveal
+        items = index.list_dir(path)
+
+        if self._tree_shown != (repo_name, path) or not self._update_tree_rows(items):
+            self._clear_tree()
+            self.browser_path_label.config(text=f"Current Path: /{path}")
+            self._insert_tree_rows(items, 0, self._tree_fill_generation, (repo_name, path))
+        self._reveal_tree_row()
+        self._update_ui_state()
+        self._schedule_prefetch()
+
+    def _clear_tree(self):
+        self._cancel_prefetch()
+        self._tree_fill_generation += 1  # Stops a fill still in progress
+        self._tree_shown = None
+        self._tree_rows = {}
+        self.repo_tree.delete(*self.repo_tree.get_children())
+
+    def _tree_row_values(self, item):
+        item_type = {"dir": "Directory", "submodule": "Submodule"}.get(item.type, "File")
+        item_size = format_size(item.size) if item.type == 'file' else ""
+        # The hidden path column holds the full path for later use
+        return (item.name, item_type, item_size, item.path)
+
+    def _insert_tree_rows(self, items, start, generation, shown):
+        """Insert rows TREE_INSERT_CHUNK at a time so huge directories never block the event loop."""
+        if generation != self._tree_fill_generation:
+            return  # The user navigated elsewhere before this directory finished filling
+        for item in items[start:start + TREE_INSERT_CHUNK]:
+            values = self._tree_row_values(item)
+            self.repo_tree.insert("", "end", iid=item.path, values=values)
+            self._tree_rows[item.path] = values
+        self._reveal_tree_row()
+        start += TREE_INSERT_CHUNK
+        if start < len(items):
+            self.browser_path_label.config(text=f"Current Path: /{self.current_repo_browser_path} (loading {start}/{len(items)})")
+            self.after(1, self._insert_tree_rows, items, start, generation, shown)
+            return
+        if len(items) > TREE_INSERT_CHUNK:
+            self.browser_path_label.config(text=f"Current Path: /{self.current_repo_browser_path} ({len(items)} items)")
+        self._tree_shown = shown
+
+    def _update_tree_rows(self, items):
+        """Bring the shown directory up to date row by row; False if it needs a full redraw.
+
+        Rows are keyed by path, so the selection and scroll position survive a
+        commit that touched only a few entries.
+        """
+        children = self.repo_tree.get_children()
+        changes = row_changes(list(children), [item.path for item in items])
+        if changes is None:
+            return False
+        deletes, inserts = changes
+        if deletes:
+            removed = [children[i] for i in deletes]
+            self.repo_tree.delete(*removed)
+            for path in removed:
+                del self._tree_rows[path]
+        inserted = {path for _, path in inserts}
+        for idx, item in enumerate(items):
+            values = self._tree_row_values(item)
+            if item.path in inserted:
+                self.repo_tree.insert("", idx, iid=item.path, values=values)
+            elif self._tree_rows[item.path] == values:
+                continue
+            else:
+                self.repo_tree.item(item.path, values=values)
+            self._tree_rows[item.path] = values
+        return True
+
+    def _show_index_change(self, repo_name):
+        """Redraw the browser from the tree index a commit was just written into, then revalidate it in the background."""
+        if repo_name != self._get_selected_repo_name():
+            return  # The next browse of that repository checks its HEAD anyway
+        index = self.core.tree_indexes.get(repo_name)
+        if index is not None:
+            self._show_directory(repo_name, index, self.current_repo_browser_path)
+        self._run_task(self._revalidate_tree_logic, repo_name, priority=PRIORITY_BACKGROUND)
+
+    def _revalidate_tree_logic(self, repo_name):
+        # Conditional requests: when nobody else has pushed, only the branch lookup is fetched
+        try:
+            index = self.core.load_tree_index(repo_name)
+            self._ui(lambda: self._show_directory(repo_name, index, self.current_repo_browser_path))
+        except Exception as e:
+            self._log(f"⚠️ Could not revalidate '{repo_name}': {e}")
+
+    # --- Prefetch ---
+
+    def _cancel_prefetch(self):
+        if self._prefetch_timer is not None:
+            self.after_cancel(self._prefetch_timer)
+            self._prefetch_timer = None
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+
+    def _schedule_prefetch(self):
+        """(Re)start the idle timer; a prefetch for the previous view is abandoned."""
+        self._cancel_prefetch()
+        if self.core.github_api is not None:
+            self._prefetch_timer = self.after(PREFETCH_IDLE_MS, self._start_prefetch)
+
+    def _start_prefetch(self):
+        self._prefetch_timer = None
+        repo_name, path = self._get_selected_repo_name(), self.current_repo_browser_path
+        index = self.core.tree_indexes.get(repo_name)
+        if index is None or not index.is_dir(path):
+            return
+        self._prefetch_task = self._run_task(self._prefetch_logic, repo_name, self._prefetch_candidates(repo_name, index, path),
+                                             priority=PRIORITY_BACKGROUND)
+
+    def _prefetch_candidates(self, repo_name, index, path):
+        """Files the user is likely to open next, most likely first."""
+        def readmes(folder):
+            return [i.path for i in index.list_dir(folder) if i.type == "file" and i.name.lower().startswith("readme")]
+
+        items = index.list_dir(path)
+        subfolders = [i.path for i in items if i.type == "dir"][:PREFETCH_MAX_FILES]
+        candidates = readmes(path) + self._recent_files.get(repo_name, [])
+        candidates += [i.path for i in items if i.type == "file"]
+        candidates += [p for folder in subfolders for p in readmes(folder)]
+        return list(dict.fromkeys(candidates))
+
+    def _prefetch_logic(self, repo_name, paths):
+        # Best effort: failures only go to the operation log, the next click simply uses the network
+        op = self.scheduler.current().id
+        try:
+            fetched = self.core.prefetch_blobs(repo_name, paths)
+            if fetched:
+                self.operation_log.info(f"Prefetched {fetched} files of '{repo_name}'.", extra={"op": op})
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            self.operation_log.info(f"Prefetch of '{repo_name}' stopped: {e}", extra={"op": op})
+
+    # --- Go to File ---
+
+    def _focus_goto(self):
+        if self.goto_entry.instate(["!disabled"]):
+            self.goto_entry.focus_set()
+            self.goto_entry.select_range(0, tk.END)
+
+    def _focus_goto_results(self):
+        if self._goto_paths:
+            self.goto_results.focus_set()
+            self.goto_results.selection_clear(0, tk.END)
+            self.goto_results.selection_set(0)
+            self.goto_results.activate(0)
+
+    def _apply_goto_filter(self):
+        """Search the path index as the query changes; the index is built on a worker the first time."""
+        query = self.goto_var.get().strip()
+        repo_name = self._get_selected_repo_name()
+        if not query or not repo_name:
+            self._show_goto_results([])
+            return
+        index = self.core.tree_indexes.get(repo_name)
+        finder = self.core.path_finders.get(repo_name)
+        if index is None or finder is None or finder.commit_sha != index.commit_sha:
+            self._show_goto_results([], "Indexing file names...")
+            if self._finder_loading != repo_name:
+                self._finder_loading = repo_name
+                self._run_task(self._load_finder_logic, repo_name, priority=PRIORITY_INTERACTIVE)
+            return
+        self._show_goto_results(finder.search(query), "No matching files.")
+
+    def _show_goto_results(self, paths, empty_text=None):
+        self._goto_paths = paths
+        self.goto_results.delete(0, tk.END)
+        if paths:
+            self.goto_results.insert(tk.END, *paths)
+        elif empty_text:
+            self.goto_results.insert(tk.END, empty_text)
+        if paths or empty_text:
+            self.goto_results.pack(after=self.goto_frame, fill=tk.X, pady=(0, 5))
+        else:
+            self.goto_results.pack_forget()
+
+    def _load_finder_logic(self, repo_name):
+        try:
+            self.core.path_finder(repo_name)
+            self._ui(self._on_finder_loaded, repo_name, True)
         except Exception as e:
-            self._log(f"❌ Failed to browse repository contents: {e}")
+            self._log(f"❌ Could not index '{repo_name}' for Go to file: {e}")
+            self._ui(self._on_finder_loaded, repo_name, False)
+
+    def _on_finder_loaded(self, repo_name, ok):
+        self._finder_loading = None
+        if repo_name != self._get_selected_repo_name() or not self.goto_var.get().strip():
+            return
+        if ok:
+            self._apply_goto_filter()
+        else:
+            self._show_goto_results([], "Could not index this repository.")
+
+    def _goto_selected_result(self):
+        selection = self.goto_results.curselection()
+        idx = selection[0] if selection else 0
+        if idx < len(self._goto_paths):
+            self._goto_file(self._goto_paths[idx])
+
+    def _goto_file(self, path):
+        """Jump the browser to the directory holding path and select its row."""
+        repo_name = self._get_selected_repo_name()
+        index = self.core.tree_indexes.get(repo_name)
+        if index is None or index.get(path) is None:
+            return  # Deleted since the search; the next keystroke drops it from the results
+        self.goto_var.set("")
+        self._show_directory(repo_name, index, os.path.dirname(path), reveal=path)
+        self.repo_tree.focus_set()
+
+    def _reveal_tree_row(self):
+        if self._reveal_path and self.repo_tree.exists(self._reveal_path):
+            self.repo_tree.selection_set(self._reveal_path)
+            self.repo_tree.focus(self._reveal_path)
+            self.repo_tree.see(self._reveal_path)
+            self._reveal_path = None
 
     def _browser_go_up(self):
         if not self.current_repo_browser_path: return
         parent_path = os.path.dirname(self.current_repo_browser_path)
         self._browse_repo(path=parent_path)
-    
+
     def _browser_refresh(self):
-        self._browse_repo(path=self.current_repo_browser_path)
+        """Re-check HEAD and reload the index if the repository has changed."""
+        self._browse_repo(path=self.current_repo_browser_path, refresh=True)
 
     def _browser_view_file(self):
         selection = self.repo_tree.selection()
@@ -441,67 +1255,127 @@ class GithubApp(tk.Tk):
         item = self.repo_tree.item(selection[0])
         item_path = item['values'][3]
         repo_name = self._get_selected_repo_name()
-        
-        self._run_in_thread(self._view_file_logic, repo_name, item_path)
+
+        recent = [item_path] + [p for p in self._recent_files.get(repo_name, []) if p != item_path]
+        self._recent_files[repo_name] = recent[:RECENT_FILES_MAX]
+        self._run_task(self._view_file_logic, repo_name, item_path, priority=PRIORITY_INTERACTIVE)
+        self._schedule_prefetch()
     
     def _view_file_logic(self, repo_name, path):
         self._log(f"📖 Opening file '{path}'...")
+        spool_path = None
         try:
-            repo = self.github_api.get_repo(repo_name)
-            file_content = repo.get_contents(path)
-            
-            content_decoded = ""
-            try:
-                content_decoded = file_content.decoded_content.decode('utf-8')
-            except (UnicodeDecodeError, AttributeError):
-                self._log("⚠️ Could not decode file content as UTF-8. It might be a binary file.")
-                content_decoded = "[Binary file - cannot be displayed or edited]"
-
-            self.after(0, self._show_file_editor_window, repo, file_content, content_decoded)
+            # A conflicting push drops the index while its rows are still on screen
+            index = self.core.tree_indexes.get(repo_name) or self.core.load_tree_index(repo_name)
+            item = index.get(path)
+            if item is None:
+                raise FileNotFoundError(path)
+            fd, spool_path = tempfile.mkstemp(prefix="github_app_", suffix=".blob")
+            os.close(fd)
+            # A binary file cannot be shown, so its download stops once the first bytes give it away
+            local = self.core.fetch_blob(repo_name, item.sha, spool_path, stop_if=looks_binary)
+            if local:
+                self._log("   - Served locally, from the blob cache or a downloaded archive.")
+
+            with open(spool_path, "rb") as f:
+                is_binary = looks_binary(f.read(BINARY_SNIFF_BYTES))
+            if is_binary:
+                self._log("⚠️ File looks binary; it can be viewed but not edited.")
         except Exception as e:
+            if spool_path: os.remove(spool_path)
             self._log(f"❌ Failed to open file: {e}")
+            return
+        finally:
+            self._clear_progress()
 
-    def _show_file_editor_window(self, repo, file_content_obj, content_text):
+        # The editor and the blob cache both read the spooled file; whichever finishes last removes it
+        release_spool = spool_remover(spool_path, 2)
+        self._ui(self._show_file_editor_window, repo_name, item, spool_path, is_binary, release_spool)
+        try:
+            if not local and os.path.getsize(spool_path) == item.size:
+                blob_store.add_file(item.sha, spool_path)
+        except OSError:
+            pass  # Caching is best effort
+        finally:
+            release_spool()
+
+    def _show_file_editor_window(self, repo_name, item, spool_path, is_binary, release_spool):
+        """Open the editor at once and stream the spooled file into it page by page."""
         editor_window = tk.Toplevel(self)
-        editor_window.title(f"Editing: {file_content_obj.path}")
+        editor_window.title(f"Editing: {item.path}")
         editor_window.geometry("800x600")
 
         text_widget = scrolledtext.ScrolledText(editor_window, wrap=tk.WORD, font=("", 10))
         text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        text_widget.insert("1.0", content_text)
-        
-        # Disable editing for binary files
-        if "[Binary file" in content_text:
-            text_widget.config(state="disabled")
 
         def save_changes():
-            new_content = text_widget.get("1.0", tk.END)
+            new_content = text_widget.get("1.0", "end-1c")
             # Pass required info to the logic function
-            self._run_in_thread(self._save_file_changes_logic, repo, file_content_obj, new_content)
+            self._run_task(self._save_file_changes_logic, repo_name, item.path, item.sha, new_content)
             editor_window.destroy()
 
         button_frame = ttk.Frame(editor_window, padding=10)
         button_frame.pack(fill=tk.X)
-        
-        save_button = ttk.Button(button_frame, text="Save Changes", command=save_changes)
-        if "[Binary file" in content_text:
-            save_button.config(state="disabled")
+
+        # Stays disabled until the whole file is in the editor, so a save can never truncate it
+        save_button = ttk.Button(button_frame, text="Save Changes", command=save_changes, state="disabled")
         save_button.pack(side=tk.RIGHT, padx=5)
         
         ttk.Button(button_frame, text="Close", command=editor_window.destroy).pack(side=tk.RIGHT)
+        status_label = ttk.Label(button_frame, text="")
+        status_label.pack(side=tk.LEFT)
+
+        source = open(spool_path, "rb")
+
+        def cleanup(event):
+            if event.widget is editor_window:
+                source.close()
+                release_spool()
+        editor_window.bind("<Destroy>", cleanup)
 
-    def _save_file_changes_logic(self, repo, file_content_obj, new_content):
-        self._log(f"💾 Saving changes to '{file_content_obj.path}'...")
+        if is_binary:
+            # Disable editing for binary files
+            text_widget.insert("1.0", f"[Binary file ({format_size(item.size)}) - cannot be displayed or edited]")
+            text_widget.config(state="disabled")
+            return
+
+        decoder = [codecs.getincrementaldecoder("utf-8")()]
+        loaded = [0]
+
+        def load_page():
+            if source.closed:
+                return  # Window closed while loading
+            data = source.read(EDITOR_PAGE_BYTES)
+            pending = decoder[0].getstate()[0]
+            try:
+                text = decoder[0].decode(data, final=not data)
+            except UnicodeDecodeError as e:
+                # Show the rest with replacement characters, but never let them be committed
+                self._log(f"⚠️ '{item.path}' is not valid UTF-8 ({e.reason} at byte {loaded[0] - len(pending) + e.start}); it can be viewed but not edited.")
+                decoder[0] = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                text = decoder[0].decode(pending + data, final=not data)
+            text_widget.insert(tk.END, text)
+            loaded[0] += len(data)
+            if data:
+                status_label.config(text=f"Loading {format_size(loaded[0])} / {format_size(item.size)}...")
+                self.after(1, load_page)
+            else:
+                text_widget.edit_reset()  # Loading is not something the user should be able to undo
+                status_label.config(text=format_size(item.size))
+                if decoder[0].errors == "strict":
+                    save_button.config(state="normal")
+                else:
+                    text_widget.config(state="disabled")
+
+        load_page()
+
+    def _save_file_changes_logic(self, repo_name, path, sha, new_content):
+        self._log(f"💾 Saving changes to '{path}'...")
         try:
-            repo.update_file(
-                path=file_content_obj.path,
-                message=f"docs: update {file_content_obj.name} via GUI",
-                content=new_content,
-                sha=file_content_obj.sha
-            )
+            self.core.save_file(repo_name, path, sha, new_content)
             self._log("✅ File saved successfully.")
-            # Refresh the browser to show new size/date if applicable
-            self._browser_refresh()
+            # The new size comes from the commit itself, not another tree fetch
+            self._ui(self._show_index_change, repo_name)
         except Exception as e:
             self._log(f"❌ Failed to save changes: {e}")
 
@@ -521,17 +1395,7 @@ class GithubApp(tk.Tk):
             self._log("Cancelled item deletion.")
             return
 
-        self._run_in_thread(self._delete_path_logic, repo_name, item_path, refresh_on_complete=True)
-
-    def _format_size(self, size_bytes):
-        if size_bytes == 0:
-            return "0 B"
-        size_name = ("B", "KB", "MB", "GB", "TB")
-        import math
-        i = int(math.floor(math.log(size_bytes, 1024)))
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
-        return f"{s} {size_name[i]}"
+        self._run_task(self._delete_path_logic, repo_name, item_path, refresh_on_complete=True)
 
     # --- General Actions & Create Repo Logic (largely unchanged) ---
 
@@ -548,44 +1412,140 @@ class GithubApp(tk.Tk):
             self._log("Cancelled download.")
             return
             
-        self._run_in_thread(self._download_repo_logic, repo_name, save_path)
+        self._run_task(self._download_repo_logic, repo_name, save_path, priority=PRIORITY_BULK)
     
     def _download_repo_logic(self, repo_name, save_path):
         try:
-            repo = self.github_api.get_repo(repo_name)
-            zip_url = repo.get_archive_link("zipball")
-            self._log(f"⬇️ Downloading from {zip_url}...")
-            
-            response = requests.get(zip_url, allow_redirects=True)
-            response.raise_for_status()
-            
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
-            
+            self.core.download_archive(repo_name, save_path, snapshot=True)
             self._log(f"✅ Repository '{repo_name}' downloaded to '{save_path}'.")
         except Exception as e:
             self._log(f"❌ Download failed: {e}")
+        finally:
+            self._clear_progress()
+
+    # --- Batch Operations ---
+
+    def _run_batch(self):
+        repo_names = self._get_selected_repo_names()
+        if not repo_names: return
+        action = BATCH_ACTIONS[self.batch_action.get()]
+        try:
+            workers = min(max(int(self.batch_workers.get()), 1), MAX_BATCH_WORKERS)
+        except (tk.TclError, ValueError):
+            workers = BATCH_WORKERS
+
+        dest_dir = None
+        if action == "delete":
+            preview = "\n".join(repo_names[:10]) + (f"\n... and {len(repo_names) - 10} more" if len(repo_names) > 10 else "")
+            if not messagebox.askyesno("Confirm Delete", f"PERMANENTLY DELETE {len(repo_names)} repositories?\n\n{preview}\n\nThis cannot be undone."):
+                self._log("Cancelled batch deletion."); return
+        else:
+            dest_dir = filedialog.askdirectory(title=f"Select the destination for {len(repo_names)} repositories")
+            if not dest_dir:
+                self._log("Cancelled batch operation."); return
+
+        self.batch_tree.delete(*self.batch_tree.get_children())
+        for repo_name in repo_names:
+            self.batch_tree.insert("", tk.END, iid=repo_name, text=repo_name, values=("Queued", ""))
+        self.batch_summary_label.config(text=f"Running '{self.batch_action.get()}' on {len(repo_names)} repositories...")
+        self._run_task(self._batch_logic, action, repo_names, dest_dir, workers, priority=PRIORITY_BULK)
+
+    def _batch_logic(self, action, repo_names, dest_dir, workers):
+        self._log(f"📦 Batch {action} of {len(repo_names)} repositories with {workers} workers...")
+        task, started = self.scheduler.current(), time.monotonic()
+        outcomes = defaultdict(list)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {submit_in_context(pool, self.scheduler.run_as, task, self._batch_item, action, repo_name, dest_dir): repo_name
+                       for repo_name in repo_names}
+            for done, future in enumerate(as_completed(futures), start=1):
+                outcomes[future.result()].append(futures[future])
+                self._set_progress(f"Batch {action}: {done}/{len(repo_names)} repositories", done / len(repo_names))
+
+        summary = (f"Batch {action} finished in {time.monotonic() - started:.1f}s: {len(outcomes['Done'])} succeeded, "
+                   f"{len(outcomes['Failed'])} failed, {len(outcomes['Cancelled'])} cancelled.")
+        self._log(("✅ " if not outcomes["Failed"] else "⚠️ ") + summary)
+        for repo_name in outcomes["Failed"]:
+            self._log(f"   - ❌ {repo_name}")
+        self._ui(lambda: self.batch_summary_label.config(text=summary))
+        self._clear_progress()
+        if action == "delete" and outcomes["Done"]:
+            self._ui(lambda: self._apply_repo_change(removed=outcomes["Done"]))
+
+    def _batch_item(self, action, repo_name, dest_dir):
+        """Run one repository of a batch, reporting into its row; returns the row's final status."""
+        def set_row(status, detail=""):
+            self._ui(self._set_batch_row, repo_name, status, detail)
+
+        self._progress_local.report = lambda text, fraction: set_row("Running", text)
+        try:
+            self.scheduler.check_cancelled()
+            set_row("Running")
+            owner, name = repo_name.split("/", 1)
+            if action == "download":
+                os.makedirs(os.path.join(dest_dir, owner), exist_ok=True)
+                self.core.download_archive(repo_name, os.path.join(dest_dir, owner, f"{name}.zip"), snapshot=True)
+            elif action == "mirror":
+                os.makedirs(os.path.join(dest_dir, owner, name), exist_ok=True)
+                self.core.sync_mirror(repo_name, os.path.join(dest_dir, owner, name))
+            else:
+                self.core.delete_repo(repo_name)
+                self._log(f"🔥 Deleted repository: {repo_name}")
+            set_row("Done")
+            return "Done"
+        except TaskCancelled:
+            set_row("Cancelled")
+            return "Cancelled"
+        except Exception as e:
+            self._log(f"❌ {repo_name}: {e}")
+            set_row("Failed", str(e))
+            return "Failed"
+        finally:
+            self._progress_local.report = None
+
+    def _set_batch_row(self, repo_name, status, detail):
+        if self.batch_tree.exists(repo_name):  # Rows go away when a new batch starts
+            self.batch_tree.item(repo_name, values=(status, detail))
 
-    def _create_repo(self): self._run_in_thread(self._create_repo_logic)
-    def _create_repo_logic(self):
+    # --- Incremental Mirror ---
+
+    def _mirror_repo(self):
+        repo_name = self._get_selected_repo_name()
+        if not repo_name: return
+
+        dest_dir = filedialog.askdirectory(title=f"Select the mirror folder for '{repo_name}'")
+        if not dest_dir:
+            self._log("Cancelled mirror.")
+            return
+
+        self._run_task(self._mirror_repo_logic, repo_name, dest_dir, priority=PRIORITY_BULK)
+
+    def _mirror_repo_logic(self, repo_name, dest_dir):
+        self._log(f"🪞 Mirroring '{repo_name}' into '{dest_dir}'...")
+        try:
+            self.core.sync_mirror(repo_name, dest_dir)
+        except Exception as e:
+            self._log(f"❌ Mirror failed: {e}")
+        finally:
+            self._clear_progress()
+
+    def _create_repo(self):
         name = self.new_repo_name.get().strip()
         if not name:
             self._log("❌ Error: Repository name is required."); return
-            
+
         desc = self.new_repo_desc.get().strip()
         private = self.new_repo_private.get()
         auto_init = self.new_repo_readme.get()
         gitignore = self.new_repo_gitignore.get().strip()
         license_key = COMMON_LICENSES[self.new_repo_license.get()]
+        self._run_task(self._create_repo_logic, name, desc, private, auto_init, gitignore, license_key)
 
+    def _create_repo_logic(self, name, desc, private, auto_init, gitignore, license_key):
         self._log(f"🚀 Creating repository '{name}'...")
         try:
-            self.user.create_repo(
-                name=name, description=desc, private=private, auto_init=auto_init,
-                gitignore_template=gitignore or None, license_template=license_key or None
-            )
-            self._log(f"✅ Successfully created repository: {self.user.login}/{name}")
-            self._run_in_thread(self._list_repos_logic) # Refresh repo list
+            full_name = self.core.create_repo(name, desc, private, auto_init, gitignore, license_key)
+            self._log(f"✅ Successfully created repository: {full_name}")
+            self._ui(lambda: self._apply_repo_change(added=[full_name]))
         except Exception as e:
             self._log(f"❌ Failed to create repository: {e}")
 
@@ -596,15 +1556,14 @@ class GithubApp(tk.Tk):
         if not messagebox.askyesno("Confirm Delete", f"PERMANENTLY DELETE '{repo_name}'?\nThis cannot be undone."):
             self._log("Cancelled repository deletion."); return
 
-        self._run_in_thread(self._delete_repo_logic, repo_name)
+        self._run_task(self._delete_repo_logic, repo_name)
 
     def _delete_repo_logic(self, repo_name):
         self._log(f"🔥 Deleting repository '{repo_name}'...")
         try:
-            repo = self.github_api.get_repo(repo_name)
-            repo.delete()
+            self.core.delete_repo(repo_name)
             self._log(f"✅ Successfully deleted repository: {repo_name}")
-            self._run_in_thread(self._list_repos_logic)
+            self._ui(lambda: self._apply_repo_change(removed=[repo_name]))
         except Exception as e:
             self._log(f"❌ Failed to delete repository: {e}")
 
@@ -620,23 +1579,13 @@ class GithubApp(tk.Tk):
             self.remote_path_entry.delete(0, tk.END)
             self.remote_path_entry.insert(0, remote_path)
         
-        self._run_in_thread(self._upload_file_logic, repo_name, local_path, remote_path)
+        self._run_task(self._upload_file_logic, repo_name, local_path, remote_path, priority=PRIORITY_BULK)
 
     def _upload_file_logic(self, repo_name, local_path, remote_path):
         self._log(f"🔼 Uploading '{local_path}' to '{repo_name}/{remote_path}'...")
         try:
-            repo = self.github_api.get_repo(repo_name)
-            with open(local_path, "rb") as f:
-                content = f.read()
-            try:
-                file_contents = repo.get_contents(remote_path)
-                repo.update_file(path=remote_path, message=f"feat: update {os.path.basename(remote_path)}", content=content, sha=file_contents.sha)
-                self._log(f"✅ Successfully updated file: {remote_path}")
-            except GithubException as e:
-                if e.status == 404: # Not Found
-                    repo.create_file(path=remote_path, message=f"feat: add {os.path.basename(remote_path)}", content=content)
-                    self._log(f"✅ Successfully created file: {remote_path}")
-                else: raise e
+            self.core.upload_file(repo_name, local_path, remote_path)
+            self._ui(self._show_index_change, repo_name)
         except Exception as e: self._log(f"❌ Failed to upload file: {e}")
 
     def _upload_folder(self):
@@ -645,72 +1594,41 @@ class GithubApp(tk.Tk):
         local_folder = filedialog.askdirectory()
         if not local_folder: self._log("Cancelled folder upload."); return
         remote_base_path = self.remote_path_entry.get().strip()
-        self._run_in_thread(self._upload_folder_logic, repo_name, local_folder, remote_base_path)
-
-    def _upload_folder_logic(self, repo_name, local_folder, remote_base_path):
-        self._log(f"🔼 Starting folder upload from '{local_folder}'...")
-        repo = self.github_api.get_repo(repo_name)
-        for root, _, files in os.walk(local_folder):
-            for file in files:
-                local_path = os.path.join(root, file)
-                relative_path = os.path.relpath(local_path, local_folder)
-                remote_path = os.path.join(remote_base_path, relative_path).replace("\\", "/")
-                self._log(f"   -> Uploading {remote_path}")
-                try:
-                    with open(local_path, 'rb') as f: content = f.read()
-                    repo.create_file(path=remote_path, message=f"feat: add {file}", content=content)
-                except GithubException as e:
-                    if e.status == 422: self._log(f"   - ⚠️ Skipping '{remote_path}', already exists.")
-                    else: self._log(f"   - ❌ Failed to upload '{local_path}': {e}")
-                except Exception as e: self._log(f"   - ❌ Failed to upload '{local_path}': {e}")
-        self._log("✅ Folder upload process complete.")
+        self._run_task(self._upload_folder_logic, repo_name, local_folder, remote_base_path, priority=PRIORITY_BULK)
+
+    def _sync_folder(self):
+        repo_name = self._get_selected_repo_name();
+        if not repo_name: return
+        local_folder = filedialog.askdirectory()
+        if not local_folder: self._log("Cancelled folder sync."); return
+        remote_base_path = self.remote_path_entry.get().strip()
+        if not messagebox.askyesno(
+            "Confirm Sync",
+            f"Make '{repo_name}/{remote_base_path}' an exact copy of '{local_folder}'?\n"
+            "Remote files that do not exist locally will be DELETED."
+        ):
+            self._log("Cancelled folder sync."); return
+        self._run_task(self._upload_folder_logic, repo_name, local_folder, remote_base_path,
+                       delete_missing=True, priority=PRIORITY_BULK)
+
+    def _upload_folder_logic(self, repo_name, local_folder, remote_base_path, delete_missing=False):
+        self._log(f"🔼 Starting folder {'sync' if delete_missing else 'upload'} from '{local_folder}'...")
+        try:
+            self.core.upload_folder(repo_name, local_folder, remote_base_path, delete_missing=delete_missing)
+            self._ui(self._show_index_change, repo_name)
+        except Exception as e:
+            self._log(f"❌ Folder {'sync' if delete_missing else 'upload'} failed: {e}")
 
     def _delete_path_logic(self, repo_name, remote_path, refresh_on_complete=False):
         self._log(f"🔥 Deleting '{remote_path}' from '{repo_name}'...")
         try:
-            repo = self.github_api.get_repo(repo_name)
-            contents = repo.get_contents(remote_path)
-            
-            if isinstance(contents, list):
-                self._log("   - It's a directory, deleting contents recursively...")
-                # Note: GitHub API doesn't have a recursive delete. We must delete files one by one.
-                # A more robust implementation would handle this, but this is a complex task.
-                # For now, we rely on the helper which can delete one item at a time.
-                # This code will fail on non-empty directories as get_contents is for a single path.
-                # A proper recursive delete is needed here for folders.
-                # For simplicity, this will only work if the API is smart or folder is empty.
-                # Let's call the delete_file method on the *directory's sha*
-                # THIS IS A SIMPLIFICATION. Real recursive delete is harder.
-                # For this app, we'll assume deleting a folder means deleting items one by one.
-                # A better approach:
-                all_files_in_dir = []
-                dir_contents = [contents]
-                while dir_contents:
-                    current_dir = dir_contents.pop(0)
-                    for item in current_dir:
-                        if item.type == 'dir':
-                            dir_contents.append(repo.get_contents(item.path))
-                        all_files_in_dir.append(item)
-                
-                for item in sorted(all_files_in_dir, key=lambda i: i.path, reverse=True):
-                    self._log(f"   - Deleting {item.path}")
-                    repo.delete_file(item.path, f"chore: remove {item.name}", item.sha)
-
-                self._log(f"✅ Successfully deleted folder and contents: {remote_path}")
-
-            else: # It's a single file
-                repo.delete_file(contents.path, f"chore: remove {contents.name}", contents.sha)
-                self._log(f"✅ Successfully deleted file: {remote_path}")
-            
+            self.core.delete_path(repo_name, remote_path)
             if refresh_on_complete:
-                self.after(100, self._browser_refresh)
-
-        except GithubException as e:
-            if e.status == 404: self._log(f"❌ Error: Path '{remote_path}' not found.")
-            else: self._log(f"❌ Error deleting path: {e}")
+                self._ui(self._show_index_change, repo_name)
+        except FileNotFoundError:
+            self._log(f"❌ Error: Path '{remote_path}' not found.")
         except Exception as e:
-            self._log(f"❌ An unexpected error occurred: {e}")
-
+            self._log(f"❌ Error deleting path: {e}")
 
 if __name__ == "__main__":
     app = GithubApp()
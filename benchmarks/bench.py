@@ -0,0 +1,273 @@
+"""Offline benchmarks for GithubCore, run against the in-process mock in mock_github.py.
+
+    python -m benchmarks.bench                       # every scenario
+    python -m benchmarks.bench browse upload --latency 50
+    python -m benchmarks.bench --json after.json --compare before.json
+
+Each scenario reports wall time, API requests (how many were answered 304
+from the response cache, and how many new connections they needed), bytes moved, the peak Python heap above the
+starting point, and how late a 20 ms main-thread tick ran while the
+operation worked on another thread, which is what the Tk loop would feel
+as UI lag. The mock server shares the process, so compare numbers between
+runs on the same machine rather than against github.com.
+
+With --compare, the run fails (exit code 1) when a scenario sends more
+requests than the baseline or is slower by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import github_core
+from github_core import GithubCore, PathFinder, TokenBucket, blob_store, request_metrics, format_size, UI_STALL_MS, WRITE_BURST
+from benchmarks.mock_github import MockGitHub, make_files
+
+# --- Constants ---
+LAG_PROBE_SECONDS = 0.02   # Main-thread tick used to measure UI lag
+SCENARIOS = ("list", "browse", "upload", "delete", "download", "mirror", "find")
+FIND_QUERIES = ("file12345", "d3/d1file9", "d9d9d9d9", "readme")  # Typed one character at a time
+
+
+class Bench:
+    """Holds the mock server, a logged-in GithubCore and the results collected so far."""
+
+    def __init__(self, args, workdir):
+        self.args = args
+        self.workdir = workdir
+        self.server = MockGitHub(latency=args.latency / 1000, rate_limit=args.rate_limit)
+        self.core = GithubCore(log=self._log)
+        self.results = []
+
+    def _log(self, message):
+        if self.args.verbose:
+            print(message, file=sys.stderr)
+
+    def measure(self, name, fn):
+        """Run fn on a worker thread, as the app's scheduler would, and record its costs."""
+        outcome = {}
+
+        def work():
+            with request_metrics.operation(name) as op:
+                try:
+                    fn()
+                except Exception as e:
+                    outcome["error"] = e
+            outcome["op"] = op
+
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            heap_start = tracemalloc.get_traced_memory()[0]
+        served_start = self.server.requests
+        connections_start = self.core.connection_stats()[0]
+        lags = []
+        started = time.perf_counter()
+        worker = threading.Thread(target=work, name=f"bench-{name}")
+        worker.start()
+        while worker.is_alive():
+            tick = time.perf_counter()
+            time.sleep(LAG_PROBE_SECONDS)
+            lags.append((time.perf_counter() - tick - LAG_PROBE_SECONDS) * 1000)
+        worker.join()
+        wall = time.perf_counter() - started
+        if "error" in outcome:
+            raise RuntimeError(f"{name} failed: {outcome['error']}") from outcome["error"]
+
+        totals = outcome["op"].totals
+        result = {
+            "scenario": name,
+            "wall": round(wall, 3),
+            "requests": totals["requests"],
+            "served": self.server.requests - served_start,
+            "connections": self.core.connection_stats()[0] - connections_start,
+            "cache_hits": totals["cache_hits"],
+            "received": totals["received"],
+            "sent": totals["sent"],
+            "peak_heap": tracemalloc.get_traced_memory()[1] - heap_start if tracemalloc.is_tracing() else None,
+            "max_lag_ms": round(max(lags, default=0.0), 1),
+            "stalls": sum(lag > UI_STALL_MS for lag in lags),
+        }
+        self.results.append(result)
+        print(format_row(result), flush=True)
+        return result
+
+    # --- Scenarios ---
+
+    def scenario_list(self):
+        self.server.add_repo_names(self.args.repos)
+        self.measure("list repos", self.core.list_repos)
+
+    def scenario_browse(self):
+        repo = "bench/browse"
+        self.server.add_repo(repo, make_files(self.args.files))
+        blob_dir = os.path.join(self.workdir, "blobs")
+        os.makedirs(blob_dir, exist_ok=True)
+
+        def browse():
+            index = self.core.load_tree_index(repo)
+            pending, files = [""], []
+            while pending:
+                for item in index.list_dir(pending.pop()):
+                    (pending if item.type == "dir" else files).append(item.path)
+            for i, path in enumerate(files[:self.args.open_files]):
+                sha, blob_path = index.get(path).sha, os.path.join(blob_dir, str(i))
+                if not self.core.fetch_blob(repo, sha, blob_path, progress=False):
+                    blob_store.add_file(sha, blob_path)  # As the viewer does
+
+        self.measure(f"browse {self.args.files} files (cold)", browse)
+        # Second visit: the tree comes back as 304s and the blobs from the blob cache
+        self.core.tree_indexes.clear()
+        self.measure(f"browse {self.args.files} files (warm)", browse)
+
+    def scenario_upload(self):
+        repo = "bench/upload"
+        self.server.add_repo(repo, {"README.md": b"# upload\n"})
+        folder = os.path.join(self.workdir, "upload")
+        for path, data in make_files(self.args.upload_files, depth=2).items():
+            local_path = os.path.join(folder, path)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, "wb") as f:
+                f.write(data)
+
+        self.measure(f"upload {self.args.upload_files} files", lambda: self.core.upload_folder(repo, folder, "data"))
+        self.measure("upload (no changes)", lambda: self.core.upload_folder(repo, folder, "data"))
+
+    def scenario_delete(self):
+        repo = "bench/delete"
+        files = make_files(self.args.delete_files, depth=self.args.depth, fan_out=2, prefix="deep")
+        files.update(make_files(100, prefix="keep"))
+        self.server.add_repo(repo, files)
+        self.measure(f"delete folder {self.args.depth} levels deep", lambda: self.core.delete_path(repo, "deep"))
+
+    def scenario_download(self):
+        repo = "bench/archive"
+        self.server.add_repo(repo, make_files(self.args.files))
+        save_path = os.path.join(self.workdir, "archive.zip")
+        self.measure(f"download {self.args.files} files", lambda: self.core.download_archive(repo, save_path))
+
+    def scenario_mirror(self):
+        repo = "bench/mirror"
+        mock_repo = self.server.add_repo(repo, make_files(self.args.files))
+        dest = os.path.join(self.workdir, "mirror")
+        os.makedirs(dest)
+        self.measure(f"mirror {self.args.files} files (first)", lambda: self.core.sync_mirror(repo, dest))
+        # Touch 1% of the files in a new commit for the incremental pass
+        head_tree = mock_repo.commits[mock_repo.head]["tree"]
+        changed = [{"path": path, "mode": mode, "type": "blob", "content": f"changed {path}\n"}
+                   for path, (mode, _) in list(mock_repo.flatten(head_tree).items())[::100]]
+        mock_repo.head = mock_repo.add_commit("change", mock_repo.apply(head_tree, changed), [mock_repo.head])
+        self.measure(f"mirror {len(changed)} changed files", lambda: self.core.sync_mirror(repo, dest))
+
+    def scenario_find(self):
+        paths = list(make_files(self.args.find_paths, depth=4, size=1))
+        finder, keystrokes = None, []
+
+        def build():
+            nonlocal finder
+            finder = PathFinder("bench", paths)
+
+        def type_queries():
+            for query in FIND_QUERIES:
+                for end in range(1, len(query) + 1):
+                    started = time.perf_counter()
+                    finder.search(query[:end])
+                    keystrokes.append((time.perf_counter() - started) * 1000)
+
+        self.measure(f"index {self.args.find_paths} paths", build)
+        self.measure(f"go to file, {sum(map(len, FIND_QUERIES))} keystrokes", type_queries)
+        keystrokes.sort()
+        print(f"{'':<34} keystroke median {keystrokes[len(keystrokes) // 2]:.1f} ms, slowest {keystrokes[-1]:.1f} ms")
+
+
+def format_row(result):
+    heap = format_size(result["peak_heap"]) if result["peak_heap"] is not None else "-"
+    requests = f"{result['requests']} ({result['cache_hits']} cached, {result.get('connections', 0)} conn)"
+    return (f"{result['scenario']:<34} {result['wall']:>8.2f}s {requests:>26} "
+            f"{format_size(result['received']):>10} down {format_size(result['sent']):>10} up "
+            f"{heap:>10} heap {result['max_lag_ms']:>7.1f} ms lag ({result['stalls']} stalls)")
+
+
+def compare(results, baseline_path, tolerance):
+    """Print regressions against a previous --json file; return True if there were any."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["scenario"]: r for r in json.load(f)["results"]}
+    regressed = False
+    for result in results:
+        before = baseline.get(result["scenario"])
+        if before is None:
+            continue
+        problems = []
+        if result["requests"] > before["requests"]:
+            problems.append(f"{before['requests']} -> {result['requests']} requests")
+        if result["wall"] > before["wall"] * (1 + tolerance):
+            problems.append(f"{before['wall']:.2f}s -> {result['wall']:.2f}s")
+        if problems:
+            regressed = True
+            print(f"❌ {result['scenario']}: {', '.join(problems)}")
+    if not regressed:
+        print(f"✅ No regressions against {baseline_path}.")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GithubCore against a local mock GitHub API.")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds added to every response")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="hourly request budget the mock reports")
+    parser.add_argument("--write-rate", type=float, default=0,
+                        help="content-creating requests per minute (default: unthrottled; GitHub allows ~80)")
+    parser.add_argument("--files", type=int, default=5000, help="files in the browse/download/mirror repositories")
+    parser.add_argument("--open-files", type=int, default=50, help="files opened while browsing")
+    parser.add_argument("--upload-files", type=int, default=2000)
+    parser.add_argument("--delete-files", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=12, help="folder depth of the deleted tree")
+    parser.add_argument("--repos", type=int, default=1000, help="repositories returned by /user/repos")
+    parser.add_argument("--find-paths", type=int, default=100000, help="paths in the go-to-file index")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows Python code down")
+    parser.add_argument("--json", metavar="FILE", help="save the results")
+    parser.add_argument("--compare", metavar="FILE", help="fail on regressions against an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed wall-time slowdown (default: 0.2)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show GithubCore's log")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario {unknown[0]!r} (choose from {', '.join(SCENARIOS)})")
+
+    if args.write_rate:
+        github_core.rate_governor.writes = TokenBucket(args.write_rate / 60, WRITE_BURST)
+    else:
+        github_core.rate_governor.writes = TokenBucket(1e9, 1e9)
+
+    # Caches are relative paths, so a scratch working directory keeps every run cold
+    original_dir = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="github-bench-")
+    os.chdir(workdir)
+    bench = Bench(args, workdir)
+    try:
+        bench.server.start()
+        bench.core.login("bench-token", base_url=bench.server.url)
+        if not args.no_memory:
+            tracemalloc.start()
+        for name in args.scenarios or SCENARIOS:
+            getattr(bench, f"scenario_{name}")()
+    finally:
+        tracemalloc.stop()
+        bench.server.stop()
+        os.chdir(original_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"options": vars(args), "results": bench.results}, f, indent=2)
+    if args.compare and compare(bench.results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,440 @@
+"""In-process stand-in for the parts of the GitHub REST API that GithubCore uses.
+
+Repositories are held in memory as real git-style objects: blob SHAs match
+git_blob_sha(), so upload de-duplication and mirror updates behave as they do
+against github.com. Tree and commit SHAs are content hashes of their JSON.
+
+    server = MockGitHub(latency=0.05)
+    server.add_repo("bench/site", make_files(5000))
+    server.start()
+    core.login("token", base_url=server.url)
+
+Covered: /user, /user/repos, /repos/:owner/:repo, branches, contents (PUT),
+git blobs/trees/commits/refs, zipball and repository create/delete. GETs carry
+ETags and honour If-None-Match; every response carries rate-limit headers.
+"""
+import base64
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+import urllib.parse
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Constants ---
+TREE_TRUNCATE_ENTRIES = 100000  # GitHub truncates recursive tree listings beyond this
+RATE_LIMIT_WINDOW = 3600        # Seconds until the rate limit resets
+
+
+def blob_sha(data):
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def object_sha(kind, payload):
+    return hashlib.sha1(f"{kind} {json.dumps(payload, sort_keys=True)}".encode()).hexdigest()
+
+
+def make_files(count, depth=3, fan_out=10, size=512, prefix=""):
+    """{path: bytes} for count files spread over a directory tree depth levels deep."""
+    files = {}
+    for i in range(count):
+        folders, n = [], i
+        for _ in range(depth):
+            folders.append(f"d{n % fan_out}")
+            n //= fan_out
+        name = f"file{i}.txt"
+        path = "/".join(([prefix] if prefix else []) + folders + [name])
+        line = f"{path} {i}\n".encode()
+        files[path] = (line * (size // len(line) + 1))[:size]
+    return files
+
+
+class GitHubError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class MockRepo:
+    """One repository: an object store plus a default branch ref."""
+
+    def __init__(self, full_name, files=None, private=True):
+        self.full_name = full_name
+        self.private = private
+        self.default_branch = "main"
+        self.blobs = {}    # sha -> bytes
+        self.trees = {}    # sha -> [{path, mode, type, sha}]
+        self.commits = {}  # sha -> {tree, parents, message}
+        self.head = None   # None until the first commit, like an empty GitHub repository
+        self.archives = {}  # commit sha -> zip bytes
+        self.lock = threading.RLock()
+        if files:
+            flat = {path: ("100644", self.add_blob(data)) for path, data in files.items()}
+            self.head = self.add_commit("Initial commit", self.build_tree(flat), [])
+
+    def add_blob(self, data):
+        sha = blob_sha(data)
+        self.blobs[sha] = data
+        return sha
+
+    def add_commit(self, message, tree_sha, parents):
+        commit = {"tree": tree_sha, "parents": parents, "message": message}
+        sha = object_sha("commit", {**commit, "time": time.time()})
+        self.commits[sha] = commit
+        return sha
+
+    def build_tree(self, flat):
+        """Store nested trees for {path: (mode, blob sha)} and return the root tree SHA."""
+        children = {}
+        for path, (mode, sha) in flat.items():
+            head, _, rest = path.partition("/")
+            if rest:
+                children.setdefault(head, {})[rest] = (mode, sha)
+            else:
+                children[head] = (mode, sha)
+        entries = []
+        for name, value in sorted(children.items()):
+            if isinstance(value, dict):
+                entries.append({"path": name, "mode": "040000", "type": "tree", "sha": self.build_tree(value)})
+            else:
+                entries.append({"path": name, "mode": value[0], "type": "blob", "sha": value[1]})
+        sha = object_sha("tree", entries)
+        self.trees[sha] = entries
+        return sha
+
+    def flatten(self, tree_sha, prefix=""):
+        """{path: (mode, blob sha)} for every file below a tree."""
+        flat = {}
+        for e in self.trees[tree_sha]:
+            path = f"{prefix}{e['path']}"
+            if e["type"] == "tree":
+                flat.update(self.flatten(e["sha"], path + "/"))
+            else:
+                flat[path] = (e["mode"], e["sha"])
+        return flat
+
+    def walk(self, tree_sha, prefix=""):
+        for e in self.trees[tree_sha]:
+            yield {**e, "path": f"{prefix}{e['path']}"}
+            if e["type"] == "tree":
+                yield from self.walk(e["sha"], f"{prefix}{e['path']}/")
+
+    def apply(self, base_tree, elements):
+        """Tree SHA for base_tree with elements applied; a null sha removes the path."""
+        flat = self.flatten(base_tree) if base_tree else {}
+        for e in elements:
+            path = e["path"].strip("/")
+            if e.get("sha") is None:
+                flat = {p: v for p, v in flat.items() if p != path and not p.startswith(path + "/")}
+            elif "content" in e:
+                flat[path] = (e["mode"], self.add_blob(e["content"].encode()))
+            else:
+                if e["sha"] not in self.blobs:
+                    raise GitHubError(422, f"Blob {e['sha']} not found")
+                flat[path] = (e["mode"], e["sha"])
+        return self.build_tree(flat)
+
+    def archive(self, commit_sha):
+        if commit_sha not in self.archives:
+            root = f"{self.full_name.replace('/', '-')}-{commit_sha[:7]}/"
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+                for path, (mode, sha) in sorted(self.flatten(self.commits[commit_sha]["tree"]).items()):
+                    zf.writestr(root + path, self.blobs[sha])
+            self.archives[commit_sha] = buffer.getvalue()
+        return self.archives[commit_sha]
+
+
+class MockGitHub:
+    """A threaded HTTP server answering GitHub API requests from MockRepo objects.
+
+    latency is added to every response, in seconds. rate_limit is the hourly
+    request budget reported in X-RateLimit-* headers; once spent, requests get
+    403 until the window (rate_window seconds) resets.
+    """
+
+    def __init__(self, latency=0.0, rate_limit=5000, rate_window=RATE_LIMIT_WINDOW, login="bench"):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.login = login
+        self.repos = {}
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._remaining = rate_limit
+        self._reset_at = time.time() + rate_window
+        self._server = None
+
+    # --- Setup ---
+
+    def add_repo(self, full_name, files=None, private=True):
+        self.repos[full_name] = MockRepo(full_name, files, private)
+        return self.repos[full_name]
+
+    def add_repo_names(self, count):
+        """Register count empty repositories, for /user/repos paging."""
+        for i in range(count):
+            self.add_repo(f"{self.login}/repo{i:05d}")
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        threading.Thread(target=self._server.serve_forever, name="mock-github", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    # --- Rate limit ---
+
+    def _spend(self, counted):
+        with self._lock:
+            self.requests += 1
+            now = time.time()
+            if now >= self._reset_at:
+                self._remaining, self._reset_at = self.rate_limit, now + self.rate_window
+            if not counted:
+                self.not_modified += 1
+            elif self._remaining > 0:
+                self._remaining -= 1
+            else:
+                return False
+            return True
+
+    def rate_headers(self):
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self._remaining),
+            "X-RateLimit-Reset": str(int(self._reset_at)),
+            "X-RateLimit-Resource": "core",
+        }
+
+    # --- JSON documents ---
+
+    def repo_json(self, repo):
+        owner, name = repo.full_name.split("/")
+        return {
+            "id": abs(hash(repo.full_name)) % 10 ** 9, "name": name, "full_name": repo.full_name,
+            "owner": {"login": owner, "url": f"{self.url}/users/{owner}"},
+            "private": repo.private, "default_branch": repo.default_branch,
+            "url": f"{self.url}/repos/{repo.full_name}",
+        }
+
+    def commit_json(self, repo, sha):
+        commit = repo.commits[sha]
+        base = f"{self.url}/repos/{repo.full_name}"
+        return {
+            "sha": sha, "url": f"{base}/git/commits/{sha}", "message": commit["message"],
+            "tree": {"sha": commit["tree"], "url": f"{base}/git/trees/{commit['tree']}"},
+            "parents": [{"sha": p, "url": f"{base}/git/commits/{p}"} for p in commit["parents"]],
+        }
+
+    def tree_json(self, repo, sha, recursive=False):
+        base = f"{self.url}/repos/{repo.full_name}"
+        entries = list(repo.walk(sha)) if recursive else repo.trees[sha]
+        truncated = len(entries) > TREE_TRUNCATE_ENTRIES
+        tree = []
+        for e in entries[:TREE_TRUNCATE_ENTRIES]:
+            item = {**e, "url": f"{base}/git/{e['type']}s/{e['sha']}"}
+            if e["type"] == "blob":
+                item["size"] = len(repo.blobs[e["sha"]])
+            tree.append(item)
+        return {"sha": sha, "url": f"{base}/git/trees/{sha}", "tree": tree, "truncated": truncated}
+
+    def ref_json(self, repo):
+        base = f"{self.url}/repos/{repo.full_name}"
+        return {
+            "ref": f"refs/heads/{repo.default_branch}", "url": f"{base}/git/refs/heads/{repo.default_branch}",
+            "object": {"sha": repo.head, "type": "commit", "url": f"{base}/git/commits/{repo.head}"},
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so client connection pooling is exercised
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes; Nagle would hold the body for the ACK
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self): self._handle("GET")
+    def do_POST(self): self._handle("POST")
+    def do_PUT(self): self._handle("PUT")
+    def do_PATCH(self): self._handle("PATCH")
+    def do_DELETE(self): self._handle("DELETE")
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+                if not size:
+                    break
+            data = b"".join(chunks)
+        else:
+            data = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        return json.loads(data) if data else {}
+
+    def _handle(self, verb):
+        mock = self.server.mock
+        parts = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        body = self._read_body()
+        if mock.latency:
+            time.sleep(mock.latency)
+        try:
+            status, payload, headers = self._route(mock, verb, urllib.parse.unquote(parts.path), query, body)
+        except GitHubError as e:
+            status, payload, headers = e.status, {"message": str(e)}, {}
+        except (KeyError, ValueError) as e:
+            status, payload, headers = 404, {"message": f"Not Found ({e})"}, {}
+
+        if isinstance(payload, bytes):
+            data, content_type = payload, "application/octet-stream"
+        else:
+            data, content_type = json.dumps(payload).encode(), "application/json; charset=utf-8"
+        etag = f'"{hashlib.sha1(data).hexdigest()}"'
+        not_modified = verb == "GET" and status == 200 and self.headers.get("If-None-Match") == etag
+        if not mock._spend(counted=not not_modified):
+            status, data, headers = 403, json.dumps({"message": "API rate limit exceeded"}).encode(), {}
+        elif not_modified:
+            status, data = 304, b""
+
+        self.send_response(status)
+        for name, value in {**mock.rate_headers(), **headers}.items():
+            self.send_header(name, value)
+        if verb == "GET" and status in (200, 304):
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self, mock, verb, path, query, body):
+        """Return (status, JSON payload or bytes, extra headers)."""
+        if path == "/user" and verb == "GET":
+            return 200, {"login": mock.login, "url": f"{mock.url}/user"}, {}
+        if path == "/user/repos":
+            if verb == "POST":
+                repo = mock.add_repo(f"{mock.login}/{body['name']}", private=body.get("private", False))
+                if body.get("auto_init"):
+                    repo.head = repo.add_commit("Initial commit", repo.build_tree({"README.md": ("100644", repo.add_blob(b"# " + body["name"].encode() + b"\n"))}), [])
+                return 201, mock.repo_json(repo), {}
+            return self._repo_page(mock, query)
+
+        match = re.match(r"^/_codeload/([^/]+/[^/]+)/legacy\.zip/([0-9a-f]{40})$", path)
+        if match:
+            return 200, mock.repos[match.group(1)].archive(match.group(2)), {}
+
+        match = re.match(r"^/repos/([^/]+/[^/]+)(/.*)?$", path)
+        if not match:
+            raise GitHubError(404, "Not Found")
+        repo = mock.repos[match.group(1)]
+        rest = match.group(2) or ""
+        with repo.lock:
+            return self._repo_route(mock, repo, verb, rest, query, body)
+
+    def _repo_page(self, mock, query):
+        per_page, page = int(query.get("per_page", 30)), int(query.get("page", 1))
+        names = sorted(mock.repos)
+        last = max(1, -(-len(names) // per_page))
+        headers = {}
+        if last > 1:
+            headers["Link"] = ", ".join(
+                f'<{mock.url}/user/repos?per_page={per_page}&page={n}>; rel="{rel}"'
+                for n, rel in ((min(page + 1, last), "next"), (last, "last")))
+        page_names = names[(page - 1) * per_page:page * per_page]
+        return 200, [mock.repo_json(mock.repos[n]) for n in page_names], headers
+
+    def _repo_route(self, mock, repo, verb, rest, query, body):
+        if rest == "":
+            if verb == "DELETE":
+                del mock.repos[repo.full_name]
+                return 204, b"", {}
+            return 200, mock.repo_json(repo), {}
+
+        if rest.startswith("/branches/"):
+            if repo.head is None:
+                raise GitHubError(404, "Branch not found")
+            commit = mock.commit_json(repo, repo.head)
+            return 200, {"name": rest[len("/branches/"):], "commit": {
+                "sha": repo.head, "url": f"{mock.url}/repos/{repo.full_name}/commits/{repo.head}",
+                "commit": {"tree": commit["tree"], "message": commit["message"], "url": commit["url"]},
+            }}, {}
+
+        match = re.match(r"^/git/refs?/heads/(.+)$", rest)
+        if match:
+            if repo.head is None:
+                raise GitHubError(409, "Git Repository is empty.")
+            if verb == "PATCH":
+                new = body["sha"]
+                # Only fast-forwards, unless forced
+                if not body.get("force") and repo.head not in repo.commits[new]["parents"]:
+                    raise GitHubError(422, "Update is not a fast forward")
+                repo.head = new
+            return 200, mock.ref_json(repo), {}
+
+        if rest.startswith("/git/") and repo.head is None and verb == "POST":
+            raise GitHubError(409, "Git Repository is empty.")
+        if rest == "/git/blobs" and verb == "POST":
+            content = body["content"]
+            data = base64.b64decode(content) if body.get("encoding") == "base64" else content.encode()
+            sha = repo.add_blob(data)
+            return 201, {"sha": sha, "url": f"{mock.url}/repos/{repo.full_name}/git/blobs/{sha}"}, {}
+        if rest.startswith("/git/blobs/"):
+            sha = rest[len("/git/blobs/"):]
+            data = repo.blobs[sha]
+            if "raw" in self.headers.get("Accept", ""):
+                return 200, data, {}
+            return 200, {"sha": sha, "size": len(data), "encoding": "base64",
+                         "content": base64.b64encode(data).decode()}, {}
+        if rest == "/git/trees" and verb == "POST":
+            sha = repo.apply(body.get("base_tree"), body["tree"])
+            return 201, mock.tree_json(repo, sha), {}
+        if rest.startswith("/git/trees/"):
+            return 200, mock.tree_json(repo, rest[len("/git/trees/"):], recursive=query.get("recursive") == "1"), {}
+        if rest == "/git/commits" and verb == "POST":
+            if body["tree"] not in repo.trees:
+                raise GitHubError(422, "Tree not found")
+            return 201, mock.commit_json(repo, repo.add_commit(body["message"], body["tree"], body.get("parents", []))), {}
+        if rest.startswith("/git/commits/"):
+            return 200, mock.commit_json(repo, rest[len("/git/commits/"):]), {}
+
+        if rest.startswith("/contents/") and verb == "PUT":
+            return self._put_contents(mock, repo, rest[len("/contents/"):], body)
+
+        match = re.match(r"^/zipball/(.+)$", rest)
+        if match:
+            sha = match.group(1) if match.group(1) in repo.commits else repo.head
+            location = f"{mock.url}/_codeload/{repo.full_name}/legacy.zip/{sha}"
+            return 302, b"", {"Location": location}
+        raise GitHubError(404, "Not Found")
+
+    def _put_contents(self, mock, repo, path, body):
+        flat = repo.flatten(repo.commits[repo.head]["tree"]) if repo.head else {}
+        existing = flat.get(path)
+        if existing and body.get("sha") != existing[1]:
+            raise GitHubError(409 if body.get("sha") else 422, f"{path} does not match")
+        sha = repo.add_blob(base64.b64decode(body["content"]))
+        tree = repo.apply(repo.commits[repo.head]["tree"] if repo.head else None,
+                          [{"path": path, "mode": "100644", "type": "blob", "sha": sha}])
+        repo.head = repo.add_commit(body["message"], tree, [repo.head] if repo.head else [])
+        base = f"{mock.url}/repos/{repo.full_name}"
+        return (200 if existing else 201), {
+            "content": {"name": path.rsplit("/", 1)[-1], "path": path, "sha": sha, "size": len(repo.blobs[sha]),
+                        "type": "file", "url": f"{base}/contents/{path}"},
+            "commit": mock.commit_json(repo, repo.head),
+        }, {}
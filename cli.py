@@ -0,0 +1,137 @@
+"""Command-line interface to the GitHub operations in github_core, for servers and cron jobs.
+
+    python cli.py list
+    python cli.py download OWNER/REPO repo.zip
+    python cli.py mirror OWNER/REPO ./mirror
+    python cli.py upload OWNER/REPO ./build --to site/
+    python cli.py sync OWNER/REPO ./docs --to docs/
+    python cli.py rm OWNER/REPO path/to/file-or-folder
+
+The token is read from --token, the GITHUB_TOKEN environment variable or
+github_token.txt, in that order. Status lines go to stderr so that the output
+of `list` can be piped. --metrics FILE.json|FILE.csv saves per-endpoint
+request statistics for the run.
+"""
+import argparse
+import os
+import sys
+import time
+from github_core import GithubCore, make_operation_logger, request_metrics, TOKEN_FILE, LOG_FILE, PROGRESS_INTERVAL
+
+
+def read_token(args):
+    if args.token:
+        return args.token
+    if os.environ.get("GITHUB_TOKEN"):
+        return os.environ["GITHUB_TOKEN"]
+    if os.path.exists(TOKEN_FILE):
+        with open(TOKEN_FILE, "r") as f:
+            return f.read().strip()
+    return None
+
+
+def make_core():
+    operation_log = make_operation_logger(LOG_FILE)
+    interactive = sys.stderr.isatty()
+    last_progress = [0.0]
+
+    def log(message):
+        operation_log.info(message, extra={"op": f"cli-{os.getpid()}"})
+        print(("\r\033[K" if interactive else "") + message, file=sys.stderr, flush=True)
+
+    def progress(text, fraction=None):
+        # Progress lines are only useful on a terminal; redirected output keeps just the log
+        now = time.monotonic()
+        if interactive and now - last_progress[0] >= PROGRESS_INTERVAL:
+            last_progress[0] = now
+            print(f"\r\033[K{text}", end="", file=sys.stderr, flush=True)
+
+    return GithubCore(log=log, progress=progress)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage GitHub repositories without the GUI.")
+    parser.add_argument("--token", help="personal access token (default: $GITHUB_TOKEN or github_token.txt)")
+    parser.add_argument("--metrics", metavar="FILE", help="write request metrics to FILE (.json or .csv)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="print the full name of every repository you can access")
+
+    download = commands.add_parser("download", help="download a repository as a .zip archive")
+    download.add_argument("repo")
+    download.add_argument("dest", nargs="?", help="archive path (default: ./<name>.zip)")
+
+    mirror = commands.add_parser("mirror", help="bring a local folder up to date with a repository")
+    mirror.add_argument("repo")
+    mirror.add_argument("dest")
+
+    upload = commands.add_parser("upload", help="upload a file or folder")
+    upload.add_argument("repo")
+    upload.add_argument("local")
+    upload.add_argument("--to", default="", help="destination path in the repository")
+
+    sync = commands.add_parser("sync", help="make a repository folder an exact copy of a local folder")
+    sync.add_argument("repo")
+    sync.add_argument("local")
+    sync.add_argument("--to", default="", help="folder in the repository")
+
+    rm = commands.add_parser("rm", help="delete a file or folder in one commit")
+    rm.add_argument("repo")
+    rm.add_argument("path")
+
+    args = parser.parse_args(argv)
+    token = read_token(args)
+    if not token:
+        parser.error(f"no token: pass --token, set GITHUB_TOKEN or create {TOKEN_FILE}")
+
+    core = make_core()
+    with request_metrics.operation(args.command) as op:
+        status = run(core, token, args)
+    core.log(f"📊 {args.command}: {op.summary()}.")
+    opened, sent = core.connection_stats()
+    if sent:
+        core.log(f"🔌 {opened} connection(s) for {sent} requests ({(sent - opened) * 100 // sent}% reused).")
+    if args.metrics:
+        (request_metrics.export_csv if args.metrics.endswith(".csv") else request_metrics.export_json)(args.metrics)
+    return status
+
+
+def run(core, token, args):
+    try:
+        core.login(token)
+        if args.command == "list":
+            for name in core.list_repos():
+                print(name)
+        elif args.command == "download":
+            dest = args.dest or f"{args.repo.split('/')[-1]}.zip"
+            core.download_archive(args.repo, dest)
+            core.log(f"✅ Repository '{args.repo}' downloaded to '{dest}'.")
+        elif args.command == "mirror":
+            os.makedirs(args.dest, exist_ok=True)
+            core.sync_mirror(args.repo, args.dest)
+        elif args.command == "upload":
+            if os.path.isdir(args.local):
+                core.upload_folder(args.repo, args.local, args.to)
+            else:
+                remote_path = args.to.strip("/")
+                if not remote_path or args.to.endswith("/"):
+                    remote_path = "/".join(p for p in (remote_path, os.path.basename(args.local)) if p)
+                core.upload_file(args.repo, args.local, remote_path)
+        elif args.command == "sync":
+            core.upload_folder(args.repo, args.local, args.to, delete_missing=True)
+        elif args.command == "rm":
+            core.delete_path(args.repo, args.path)
+    except KeyboardInterrupt:
+        core.log("⏹️ Interrupted.")
+        return 130
+    except FileNotFoundError as e:
+        core.log(f"❌ Not found: {e}")
+        return 1
+    except Exception as e:
+        core.log(f"❌ {args.command} failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1922 @@
+"""GitHub operations shared by the desktop app and the command line.
+
+Nothing in here imports tkinter: GithubCore reports through plain callbacks,
+so the same code runs in the GUI, in cli.py and on headless machines.
+
+PyGithub and requests take longer to import than the rest of the app takes
+to start, so they (and github_transport, which builds on them) are imported
+inside the methods that first need the network.
+"""
+import os
+import threading
+import time
+import glob
+import re
+import json
+import hashlib
+import random
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import base64
+import codecs
+import zlib
+import struct
+import io
+import urllib.parse
+from contextlib import contextmanager
+import contextvars
+import itertools
+import csv
+import tempfile
+import zipfile
+import bisect
+import heapq
+import shutil
+import stat
+from collections import namedtuple, defaultdict, deque
+
+# --- Constants ---
+TOKEN_FILE = "github_token.txt"
+UPLOAD_WORKERS = 8          # Concurrent blob uploads during a folder upload
+MAX_FILE_BYTES = 100 * 1024 * 1024   # GitHub rejects larger files outright (use Git LFS)
+LARGE_FILE_BYTES = 50 * 1024 * 1024  # GitHub warns about files above this size
+MAX_INFLIGHT_UPLOAD_BYTES = 128 * 1024 * 1024  # File bytes being uploaded at once across all workers
+BASE64_CHUNK = 3 * 64 * 1024         # Multiple of 3 so chunks encode without padding
+HASH_POOL_THRESHOLD = 500  # Local files hashed in a process pool above this count
+MAX_REF_UPDATE_RETRIES = 5  # Attempts to move a branch that keeps moving under us
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_TIMEOUT = (10, 60)  # (connect, read) seconds
+DOWNLOAD_WORKERS = 8         # Concurrent blob downloads during a mirror update
+API_TIMEOUT = 30             # Seconds, for PyGithub's API calls
+HTTP_POOL_SIZE = 2 * max(UPLOAD_WORKERS, DOWNLOAD_WORKERS)  # Keep-alive connections per host: every core worker plus the app's own threads
+HTTP_POOL_HOSTS = 4          # api.github.com, codeload.github.com and the hosts they redirect to
+HTTP_RETRIES = 3             # Connection errors and 5xx responses, for GET/HEAD only
+MIRROR_STATE_FILE = ".github_mirror.json"  # Last synced commit and file list, kept in the mirror folder
+BINARY_SNIFF_BYTES = 8192    # Bytes inspected to decide whether a file is binary
+PROGRESS_INTERVAL = 0.25     # Seconds between progress reports during a transfer
+REPO_PAGE_SIZE = 100      # The API maximum for /user/repos
+REPO_LIST_WORKERS = 6     # Repository list pages fetched concurrently
+LOG_FILE = "github_app.log"
+LOG_FILE_MAX_BYTES, LOG_FILE_BACKUPS = 5 * 1024 * 1024, 3
+CACHE_DIR = ".github_cache"
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+REPO_LIST_CACHE = os.path.join(CACHE_DIR, "repos.json")
+BLOB_CACHE_DIR = os.path.join(CACHE_DIR, "blobs")
+BLOB_CACHE_MAX_BYTES = int(os.environ.get("GITHUB_APP_BLOB_CACHE_MB", "1024")) * 1024 * 1024
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+FINDER_CACHE_DIR = os.path.join(CACHE_DIR, "paths")
+FINDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "snapshots")  # Indexes of downloaded archives, one per repository
+RATE_LIMIT_RESERVE = 0.1     # Below this share of the hourly budget, requests are spread until the reset
+WRITE_RATE, WRITE_BURST = 80 / 60, 20  # GitHub's secondary limit: ~80 content-creating requests a minute
+MAX_RATE_LIMIT_RETRIES = 8
+BACKOFF_BASE, BACKOFF_MAX = 2.0, 300.0  # Seconds, for rate-limit responses without a Retry-After
+METRICS_MAX_OPERATIONS = 200    # Operations kept by request_metrics, oldest dropped first
+METRICS_MAX_REQUESTS = 10000    # Individual request records kept for export
+UI_STALL_MS = 50                # Event-loop delays above this count as UI stalls
+PREFETCH_MAX_BYTES = 512 * 1024  # Larger files are only fetched when they are opened
+PREFETCH_MAX_FILES = 30          # Files prefetched per idle period
+PREFETCH_RESERVE = 0.5           # Prefetching stops once less than this share of the rate limit is left
+FINDER_RESULTS = 50              # Matches listed by "Go to file"
+FINDER_SCAN_LIMIT = 3000         # Candidate paths ranked one by one; above this the first matches are ranked
+
+
+class DiskLRU:
+    """Size-capped cache directory whose least recently used files are evicted first.
+
+    File mtimes double as the LRU clock, so they survive restarts.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size = None  # Bytes on disk, computed on first store
+        self._lock = threading.Lock()
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _stored(self, path, previous=0):
+        """Account for a file just written to path, replacing one of previous bytes. Call with _lock held."""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._files())
+        else:
+            self._size += os.path.getsize(path) - previous
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is back under 90% of its cap."""
+        for _, size, path in sorted(self._files()):
+            if self._size <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                pass
+
+
+class ResponseCache(DiskLRU):
+    """On-disk store of GitHub GET responses, revalidated with ETag / Last-Modified.
+
+    Entries are namespaced by a hash of the Authorization header so one token
+    never sees responses fetched with another.
+    """
+
+    def __init__(self, directory, max_bytes):
+        super().__init__(directory, max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, headers, url):
+        namespace = hashlib.sha256(headers.get("Authorization", "").encode()).hexdigest()[:16]
+        key = hashlib.sha256(f"{headers.get('Accept', '')} {url}".encode()).hexdigest()
+        return os.path.join(self.directory, namespace, key + ".json")
+
+    def load(self, headers, url):
+        try:
+            with open(self._entry_path(headers, url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def validators(self, entry):
+        conditions = {}
+        if entry.get("etag"): conditions["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"): conditions["If-Modified-Since"] = entry["last_modified"]
+        return conditions
+
+    def hit(self, headers, url):
+        with self._lock:
+            self.hits += 1
+        self._touch(self._entry_path(headers, url))
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def store(self, headers, url, response_headers, body):
+        response_headers = {k.lower(): v for k, v in response_headers.items()}
+        entry = {
+            "etag": response_headers.get("etag"),
+            "last_modified": response_headers.get("last-modified"),
+            "headers": response_headers,
+            "body": body,
+        }
+        if not (entry["etag"] or entry["last_modified"]):
+            return
+        path = self._entry_path(headers, url)
+        data = json.dumps(entry).encode("utf-8")
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                previous = os.path.getsize(path) if os.path.exists(path) else 0
+                with open(path, "wb") as f:
+                    f.write(data)
+            except OSError:
+                return
+            self._stored(path, previous)
+
+
+def git_blob_sha(path):
+    """The SHA-1 git gives a file's contents as a blob object."""
+    digest = hashlib.sha1(b"blob %d\0" % os.path.getsize(path))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobStore(DiskLRU):
+    """Content-addressed cache of git blobs, zlib-compressed and keyed by blob SHA.
+
+    Identical content is stored once, whichever repository or branch it came
+    from. Blobs are verified against their SHA before they are admitted.
+    """
+
+    def _blob_path(self, sha):
+        return os.path.join(self.directory, sha[:2], sha[2:])
+
+    def has(self, sha):
+        return os.path.exists(self._blob_path(sha))
+
+    def extract(self, sha, dest_path):
+        """Decompress a cached blob to dest_path; returns False if it is not cached."""
+        path = self._blob_path(sha)
+        try:
+            with open(path, "rb") as src, open(dest_path, "wb") as out:
+                decompressor = zlib.decompressobj()
+                for chunk in iter(lambda: src.read(DOWNLOAD_CHUNK_SIZE), b""):
+                    out.write(decompressor.decompress(chunk))
+                out.write(decompressor.flush())
+        except FileNotFoundError:
+            return False
+        except (OSError, zlib.error):
+            for stale in (path, dest_path):  # Corrupt entry and its partial output; the caller falls back to the network
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            return False
+        self._touch(path)
+        return True
+
+    def add_file(self, sha, src_path):
+        with open(src_path, "rb") as f:
+            return self._add(sha, f, os.path.getsize(src_path))
+
+    def add_bytes(self, sha, data):
+        return self._add(sha, io.BytesIO(data), len(data))
+
+    def _add(self, sha, stream, size):
+        path = self._blob_path(sha)
+        if os.path.exists(path):
+            self._touch(path)
+            return True
+        digest = hashlib.sha1(b"blob %d\0" % size)
+        compressor = zlib.compressobj()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as out:
+                for chunk in iter(lambda: stream.read(DOWNLOAD_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    out.write(compressor.compress(chunk))
+                out.write(compressor.flush())
+            if digest.hexdigest() != sha:
+                os.remove(tmp_path)
+                return False
+            with self._lock:
+                os.replace(tmp_path, path)
+                self._stored(path)
+        except OSError:
+            return False
+        return True
+
+
+response_cache = ResponseCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES)
+blob_store = BlobStore(BLOB_CACHE_DIR, BLOB_CACHE_MAX_BYTES)
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimitGovernor:
+    """Paces every GitHub API request and waits out rate-limit responses.
+
+    Tracks the budget reported in the X-RateLimit-* headers, spreads the last
+    RATE_LIMIT_RESERVE of it evenly until the reset, keeps writes under the
+    secondary limit with a token bucket, and turns 403/429 rate-limit
+    responses into a pause followed by a retry instead of an error.
+    """
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None      # Epoch seconds
+        self.paused_until = 0.0   # Epoch seconds
+        self.writes = TokenBucket(WRITE_RATE, WRITE_BURST)
+        self.on_change = None     # Called from worker threads after every update
+        self.should_abort = None  # Called while waiting; may raise to abandon the request
+        # Returns the longest rate-limit pause the calling thread accepts, or None for any. Threads
+        # with a limit act for a waiting user: they fail fast on pauses and are not paced.
+        self.max_wait = None
+        self._next_slot = 0.0     # Monotonic time of the next paced request, shared by every thread
+        self._lock = threading.Lock()
+
+    def before_request(self, verb):
+        limit = self.max_wait() if self.max_wait else None
+        delay = max(self.paused_until - time.time(), 0.0)
+        self._check_wait(delay, limit)
+        if verb != "GET":
+            delay = max(delay, self.writes.reserve())
+        if limit is None:
+            delay = max(delay, self._pace())
+        if delay > 0:
+            self._wait(delay)
+
+    def _pace(self):
+        """Reserve the next slot when the budget runs low; returns how long to wait for it."""
+        with self._lock:
+            if not (self.limit and self.remaining is not None and self.remaining < self.limit * RATE_LIMIT_RESERVE):
+                return 0.0
+            # Running low: spread what is left over the time until the window resets.
+            window = max(self.reset_at - time.time(), 0.0)
+            now = time.monotonic()
+            slot = min(max(now, self._next_slot), now + window)
+            self._next_slot = slot + window / max(self.remaining, 1)
+            return slot - now
+
+    def after_response(self, status, headers, body, attempt):
+        """Record the budget headers; return seconds to wait before a retry, or None to accept the response."""
+        with self._lock:
+            if "X-RateLimit-Remaining" in headers:
+                self.limit = int(headers.get("X-RateLimit-Limit", self.limit or 0))
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+                self.reset_at = int(headers.get("X-RateLimit-Reset", time.time()))
+        self._notify()
+        limited = status == 429 or status == 403 and (
+            headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in headers or "rate limit" in body.lower())
+        if not limited or attempt >= MAX_RATE_LIMIT_RETRIES:
+            return None
+        if "Retry-After" in headers:
+            delay = float(headers["Retry-After"])
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            delay = float(headers.get("X-RateLimit-Reset", time.time())) - time.time() + 1
+        else:  # Secondary limit without guidance: exponential backoff with full jitter
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+        return max(delay, 1.0)
+
+    def has_budget(self, reserve):
+        """False while paused or once less than reserve (a share) of the hourly budget is left."""
+        with self._lock:
+            if self.paused_until > time.time():
+                return False
+            return not self.limit or self.remaining is None or self.remaining >= self.limit * reserve
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.time() + seconds)
+        self._notify()
+        self._check_wait(seconds, self.max_wait() if self.max_wait else None)
+        self._wait(seconds)
+
+    def _check_wait(self, seconds, limit):
+        if limit is not None and seconds > limit:
+            raise RateLimited(time.time() + seconds)
+
+    def _wait(self, seconds):
+        deadline = time.monotonic() + seconds
+        while True:
+            if self.should_abort:
+                self.should_abort()
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return
+            time.sleep(min(left, 0.5))
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change()
+
+
+rate_governor = RateLimitGovernor()
+
+
+RequestRecord = namedtuple("RequestRecord", "op verb endpoint status latency sent received cache rate_cost")
+
+
+def endpoint_of(url):
+    """Collapse a URL into an endpoint template, e.g. /repos/:owner/:repo/git/trees/:sha."""
+    parts = urllib.parse.urlsplit(url)
+    path = re.sub(r"\b[0-9a-f]{40}\b", ":sha", parts.path)
+    if parts.netloc.startswith("codeload."):
+        # Archive downloads (codeload.github.com/<owner>/<repo>/...)
+        return parts.netloc + re.sub(r"^/[^/]+/[^/]+", "/:owner/:repo", path)
+    path = re.sub(r"^/repos/[^/]+/[^/]+", "/repos/:owner/:repo", path)
+    path = re.sub(r"/contents/.+", "/contents/:path", path)
+    path = re.sub(r"/(branches|git/refs?)/.+", r"/\1/:name", path)
+    return path
+
+
+class OperationStats:
+    """Request totals for one user-level operation, overall and per endpoint."""
+
+    FIELDS = ("requests", "errors", "latency", "sent", "received", "cache_hits", "cache_misses", "rate_cost")
+
+    def __init__(self, op_id, name):
+        self.id = op_id
+        self.name = name
+        self.started = time.time()
+        self.ended = None
+        self.totals = dict.fromkeys(self.FIELDS, 0)
+        self.endpoints = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+
+    def add(self, record):
+        for totals in (self.totals, self.endpoints[f"{record.verb} {record.endpoint}"]):
+            totals["requests"] += 1
+            totals["errors"] += not record.status or record.status >= 400
+            totals["latency"] += record.latency
+            totals["sent"] += record.sent
+            totals["received"] += record.received
+            totals["cache_hits"] += record.cache == "hit"
+            totals["cache_misses"] += record.cache == "miss"
+            totals["rate_cost"] += record.rate_cost
+
+    def summary(self):
+        t = self.totals
+        return (f"{t['requests']} requests ({t['cache_hits']} from cache, {t['errors']} failed), "
+                f"{t['latency']:.2f}s in HTTP, {format_size(t['received'])} down / {format_size(t['sent'])} up, "
+                f"rate cost {t['rate_cost']}")
+
+    def as_dict(self):
+        return {
+            "id": self.id, "name": self.name, "started": self.started,
+            "duration": (self.ended or time.time()) - self.started,
+            **self.totals,
+            "endpoints": {endpoint: dict(totals) for endpoint, totals in self.endpoints.items()},
+        }
+
+
+_current_operation = contextvars.ContextVar("current_operation", default=None)
+
+
+def submit_in_context(pool, fn, *args):
+    """pool.submit() that carries the caller's context, and so its current operation, into the worker."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+class RequestMetrics:
+    """Every HTTP request the app makes, grouped by the operation that made it.
+
+    governed_request() and GithubCore.stream_to_file() call record(); code
+    wraps a user-level action in operation(name) to group what it sends.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.operations = deque(maxlen=METRICS_MAX_OPERATIONS)
+        self.requests = deque(maxlen=METRICS_MAX_REQUESTS)
+        self.other = OperationStats(0, "other")  # Requests made outside any operation
+        self.ui_stalls = 0
+        self.max_ui_lag_ms = 0.0
+
+    @contextmanager
+    def operation(self, name):
+        op = OperationStats(next(self._ids), name)
+        with self._lock:
+            self.operations.append(op)
+        token = _current_operation.set(op)
+        try:
+            yield op
+        finally:
+            _current_operation.reset(token)
+            op.ended = time.time()
+
+    def record(self, verb, url, status, latency, sent=0, received=0, cache=None, rate_cost=0):
+        op = _current_operation.get()
+        record = RequestRecord(op.id if op else None, verb, endpoint_of(url), status, latency, sent, received, cache, rate_cost)
+        with self._lock:
+            self.requests.append(record)
+            (op or self.other).add(record)
+
+    def record_ui_lag(self, lag_ms):
+        with self._lock:
+            self.ui_stalls += 1
+            self.max_ui_lag_ms = max(self.max_ui_lag_ms, lag_ms)
+
+    def snapshot(self):
+        """Plain-data copy of the per-operation aggregates, oldest first."""
+        with self._lock:
+            operations = list(self.operations) + ([self.other] if self.other.totals["requests"] else [])
+            return [op.as_dict() for op in operations]
+
+    def export_json(self, path):
+        with self._lock:
+            records = [r._asdict() for r in self.requests]
+            ui = {"stalls": self.ui_stalls, "max_lag_ms": round(self.max_ui_lag_ms, 1), "stall_threshold_ms": UI_STALL_MS}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"operations": self.snapshot(), "requests": records, "ui": ui}, f, indent=1)
+
+    def export_csv(self, path):
+        """One row per operation (endpoint empty) followed by one row per endpoint it called."""
+        columns = ["op", "operation", "endpoint", "duration", *OperationStats.FIELDS]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for op in self.snapshot():
+                writer.writerow([op["id"], op["name"], "", round(op["duration"], 3)]
+                                + [op[field] for field in OperationStats.FIELDS])
+                for endpoint, totals in op["endpoints"].items():
+                    writer.writerow([op["id"], op["name"], endpoint, ""] + [totals[field] for field in OperationStats.FIELDS])
+
+
+request_metrics = RequestMetrics()
+
+
+def governed_request(session, verb, url, **kwargs):
+    """Send one request through the rate-limit governor, retrying rate-limited attempts."""
+    body = kwargs.get("data")
+    headers = kwargs.get("headers") or {}
+    conditional = "If-None-Match" in headers or "If-Modified-Since" in headers
+    attempt = 0
+    while True:
+        rate_governor.before_request(verb)
+        started = time.perf_counter()
+        try:
+            r = session.request(verb, url, **kwargs)
+        except Exception:
+            request_metrics.record(verb, url, None, time.perf_counter() - started)
+            raise
+        request_metrics.record(
+            verb, url, r.status_code, time.perf_counter() - started,
+            sent=len(body) if hasattr(body, "__len__") else 0,
+            received=len(r.content) if not kwargs.get("stream") else int(r.headers.get("Content-Length") or 0),
+            cache=("hit" if r.status_code == 304 else "miss") if conditional else None,
+            # GitHub does not charge for a 304; unmetered hosts send no rate-limit headers
+            rate_cost=int(r.status_code != 304 and "X-RateLimit-Remaining" in r.headers),
+        )
+        delay = rate_governor.after_response(r.status_code, r.headers, r.text if r.status_code in (403, 429) else "", attempt)
+        if delay is None:
+            return r
+        if hasattr(body, "read"):
+            if not hasattr(body, "rewind"):
+                return r  # A consumed stream cannot be replayed
+            body.rewind()
+        attempt += 1
+        rate_governor.pause(delay)
+
+
+class Base64JsonBody:
+    """File-like request body: a JSON object whose "content" is a file, base64-encoded on the fly.
+
+    The file is read BASE64_CHUNK bytes at a time, so memory use does not grow
+    with the file, and the encoded length is known up front so the request
+    goes out with a Content-Length rather than chunked.
+    """
+
+    def __init__(self, path, fields):
+        head = json.dumps(fields)[:-1] + (", " if fields else "") + '"content": "'
+        self._prefix = head.encode("utf-8")
+        self._suffix = b'"}'
+        self._path = path
+        self.size = os.path.getsize(path)
+        self._length = len(self._prefix) + 4 * ((self.size + 2) // 3) + len(self._suffix)
+        self._file = None
+        self.rewind()
+
+    def __len__(self):
+        return self._length
+
+    def rewind(self):
+        self.close()
+        self._file = open(self._path, "rb")
+        self._pending = self._prefix
+        self._done = False
+
+    def read(self, size=-1):
+        while (size is None or size < 0 or len(self._pending) < size) and not self._done:
+            chunk = self._file.read(BASE64_CHUNK)
+            if chunk:
+                self._pending += base64.b64encode(chunk)
+            else:
+                self._pending += self._suffix
+                self._done = True
+        if size is None or size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class ByteBudget:
+    """Caps the bytes of file content in flight across concurrent uploads."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._used = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def reserve(self, size):
+        size = min(size, self.limit)  # A file bigger than the whole budget still goes, just alone
+        with self._cond:
+            self._cond.wait_for(lambda: self._used + size <= self.limit)
+            self._used += size
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._used -= size
+                self._cond.notify_all()
+
+
+upload_budget = ByteBudget(MAX_INFLIGHT_UPLOAD_BYTES)
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that noticed it has been cancelled."""
+
+    def __init__(self):
+        super().__init__("cancelled by user")
+
+
+class RateLimited(Exception):
+    """Raised instead of waiting longer than RateLimitGovernor.max_wait allows."""
+
+    def __init__(self, until):
+        super().__init__(f"rate limited until {time.strftime('%H:%M', time.localtime(until))}")
+        self.until = until
+
+
+TreeItem = namedtuple("TreeItem", "name path type size sha")
+GitTreeEntry = namedtuple("GitTreeEntry", "type size sha")  # The fields RepoTreeIndex reads from a GitTreeElement
+GIT_OBJECT_TYPES = {"tree": "dir", "blob": "file", "commit": "submodule"}
+
+
+class RepoTreeIndex:
+    """Every path of a repository at one commit, grouped by parent directory."""
+
+    def __init__(self, commit_sha, entries, from_archive=False):
+        self.commit_sha = commit_sha
+        # A zipball leaves out export-ignore paths and submodules and may rewrite files, so such an index is partial
+        self.from_archive = from_archive
+        self._items = {}
+        self._children = {"": []}
+        for path, element in entries:
+            item_type = GIT_OBJECT_TYPES.get(element.type, "file")
+            parent, _, name = path.rpartition("/")
+            item = TreeItem(name, path, item_type, element.size or 0, element.sha)
+            self._items[path] = item
+            self._children.setdefault(parent, []).append(item)
+            if item_type == "dir":
+                self._children.setdefault(path, [])
+        # Indexes are built on a worker thread, so sort every directory here rather than in the UI.
+        for children in self._children.values():
+            children.sort(key=lambda c: (c.type != 'dir', c.name.lower()))
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, path):
+        return self._items.get(path)
+
+    def is_dir(self, path):
+        return path in self._children
+
+    def list_dir(self, path):
+        """Return a directory's items, directories first, then files, all alphabetically."""
+        return self._children[path]
+
+    def file_paths(self):
+        """Every file path, sorted."""
+        return sorted(item.path for item in list(self._items.values()) if item.type == "file")
+
+    def apply(self, commit_sha, changes):
+        """Move the index to a commit made on top of it from what that commit changed.
+
+        changes maps file paths to (blob sha, size), or to None for removed paths.
+        Directory listings are replaced rather than edited in place, so a list
+        the UI is still drawing from never changes under it.
+        """
+        for path, change in changes.items():
+            if change is None:
+                self._remove(path)
+            else:
+                self._set_file(path, *change)
+        self.commit_sha = commit_sha
+
+    def _replace_child(self, parent, name, item):
+        children = [c for c in self._children[parent] if c.name != name]
+        if item is not None:
+            children.append(item)
+            children.sort(key=lambda c: (c.type != 'dir', c.name.lower()))
+        self._children[parent] = children
+
+    def _set_file(self, path, sha, size):
+        parent, _, name = path.rpartition("/")
+        if parent and parent not in self._children:
+            # A new directory; git only knows its tree sha once the commit exists
+            self._set_dir(parent)
+        item = TreeItem(name, path, "file", size, sha)
+        self._items[path] = item
+        self._replace_child(parent, name, item)
+
+    def _set_dir(self, path):
+        parent, _, name = path.rpartition("/")
+        if parent and parent not in self._children:
+            self._set_dir(parent)
+        item = TreeItem(name, path, "dir", 0, None)
+        self._items[path] = item
+        self._children[path] = []
+        self._replace_child(parent, name, item)
+
+    def _remove(self, path):
+        item = self._items.pop(path, None)
+        if item is None:
+            return
+        self._forget_below(path)
+        parent, _, name = path.rpartition("/")
+        self._replace_child(parent, name, None)
+        if parent and not self._children[parent]:
+            self._remove(parent)  # Git has no empty directories
+
+    def _forget_below(self, path):
+        for child in self._children.pop(path, []):
+            self._items.pop(child.path, None)
+            self._forget_below(child.path)
+
+
+def looks_binary(head):
+    """Guess from the first few KB of a file whether it is binary rather than UTF-8 text."""
+    if b"\0" in head:
+        return True
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+
+class SubstringIndex:
+    """Case-insensitive substring search over a fixed list of strings.
+
+    Queries of three or more characters only scan the strings that contain
+    all of the query's trigrams; search() can also be restricted to the
+    previous result, which keeps type-ahead filtering incremental.
+    """
+
+    def __init__(self, strings):
+        self.strings = list(strings)
+        self._lower = [s.lower() for s in self.strings]
+        self._trigrams = defaultdict(set)
+        for i, s in enumerate(self._lower):
+            for j in range(len(s) - 2):
+                self._trigrams[s[j:j + 3]].add(i)
+
+    def search(self, query, within=None):
+        """Return indexes of matching strings, prefix matches (of the whole string or its last path part) first."""
+        q = query.lower()
+        if len(q) >= 3:
+            postings = sorted((self._trigrams.get(q[j:j + 3], set()) for j in range(len(q) - 2)), key=len)
+            candidates = set.intersection(*postings)
+            if within is not None:
+                candidates.intersection_update(within)
+        else:
+            candidates = within if within is not None else range(len(self.strings))
+        matches = [i for i in candidates if q in self._lower[i]]
+        return sorted(matches, key=lambda i: (not self._lower[i].rpartition("/")[2].startswith(q)
+                                              and not self._lower[i].startswith(q), i))
+
+
+BIT_FLAGS = bytes.maketrans(b"01", b"\0\1")  # bin() digits to itertools.compress() selectors
+
+
+class PathFinder:
+    """Fuzzy "Go to file" search over every file path of one commit.
+
+    Each character maps to a bitset (an int, bit i for path i) of the paths
+    that contain it, so ANDing the bitsets of a query's characters leaves only
+    the paths worth checking. File names starting with the query rank first,
+    then names and paths containing it, then paths holding its characters in
+    order ("gcore" finds github_core.py); shorter paths win ties.
+    """
+
+    def __init__(self, commit_sha, paths, char_bits=None):
+        self.commit_sha = commit_sha
+        self.paths = list(paths)
+        self._lower = [p.lower() for p in self.paths]
+        self._names = [p.rpartition("/")[2] for p in self._lower]
+        # All paths in one string, so a literal query is a single C-level scan
+        self._text = "\n".join(self._lower) + "\n"
+        self._starts = list(itertools.accumulate((len(p) + 1 for p in self._lower), initial=0))
+        self._char_bits = self._index_chars(self._lower) if char_bits is None else char_bits
+
+    def __len__(self):
+        return len(self.paths)
+
+    @staticmethod
+    def _index_chars(lower):
+        rows = defaultdict(list)
+        for i, path in enumerate(lower):
+            for c in set(path):
+                rows[c].append(i)
+        char_bits = {}
+        for c, ids in rows.items():
+            flags = bytearray(b"0" * len(lower))
+            for i in ids:
+                flags[i] = ord("1")
+            char_bits[c] = int(bytes(flags[::-1]), 2)
+        return char_bits
+
+    @staticmethod
+    def _ids(bits):
+        """Positions of the set bits, lowest first."""
+        flags = bin(bits)[:1:-1].encode("ascii").translate(BIT_FLAGS)
+        return itertools.compress(itertools.count(), flags)
+
+    def _rank(self, i, query, in_order):
+        """Sort key of path i, or None if it does not match."""
+        path, name = self._lower[i], self._names[i]
+        if query in name:
+            tier = 0 if name.startswith(query) else 1
+        elif query in path:
+            tier = 2
+        elif in_order.match(path):
+            tier = 3
+        else:
+            return None
+        return tier, len(path), path
+
+    def search(self, query, limit=FINDER_RESULTS):
+        """Return up to limit paths matching query, best first."""
+        query = query.lower()
+        candidates = -1 if query else 0
+        for c in set(query):
+            candidates &= self._char_bits.get(c, 0)
+        if not candidates:
+            return []
+        # [^c]*c never backtracks into an earlier character, so a match costs one pass over the path
+        in_order = re.compile("".join(f"[^{re.escape(c)}]*{re.escape(c)}" for c in query))
+
+        if bin(candidates).count("1") <= FINDER_SCAN_LIMIT:
+            matches = self._ids(candidates)
+        else:
+            matches = self._dense_matches(query, candidates, in_order, limit)
+        ranked = ((self._rank(i, query, in_order), i) for i in matches)
+        return [self.paths[i] for _, i in heapq.nsmallest(limit, (r for r in ranked if r[0] is not None))]
+
+    def _dense_matches(self, query, candidates, in_order, limit):
+        """Matches worth ranking when too many paths have the query's characters to rank them all."""
+        # Paths containing the query outrank every in-order match, so with enough of them only they are ranked
+        literal = []
+        pos = self._text.find(query)
+        while pos != -1 and len(literal) <= FINDER_SCAN_LIMIT:
+            i = bisect.bisect_right(self._starts, pos) - 1
+            literal.append(i)
+            pos = self._text.find(query, self._starts[i + 1])
+        if len(literal) > FINDER_SCAN_LIMIT:
+            return literal[:limit]  # A short or common query: rank the first matches rather than all of them
+        matches = literal
+        if len(matches) < limit:
+            seen = set(literal)
+            for i in self._ids(candidates):
+                if i not in seen and in_order.match(self._lower[i]):
+                    matches.append(i)
+                    if len(matches) == limit:
+                        break
+        return matches
+
+    def dumps(self):
+        return json.dumps({"paths": self.paths, "chars": {c: format(bits, "x") for c, bits in self._char_bits.items()}})
+
+    @classmethod
+    def loads(cls, commit_sha, data):
+        data = json.loads(data)
+        return cls(commit_sha, data["paths"], {c: int(bits, 16) for c, bits in data["chars"].items()})
+
+
+class PathFinderStore(DiskLRU):
+    """PathFinder indexes on disk, zlib-compressed and keyed by commit SHA.
+
+    A commit's paths never change, so an index built once serves every later
+    visit to that commit, across restarts.
+    """
+
+    def _index_path(self, commit_sha):
+        return os.path.join(self.directory, commit_sha + ".json.z")
+
+    def load(self, commit_sha):
+        path = self._index_path(commit_sha)
+        try:
+            with open(path, "rb") as f:
+                finder = PathFinder.loads(commit_sha, zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, zlib.error):
+            try:
+                os.remove(path)  # Corrupt entry; the caller rebuilds it
+            except OSError:
+                pass
+            return None
+        self._touch(path)
+        return finder
+
+    def save(self, finder):
+        path = self._index_path(finder.commit_sha)
+        data = zlib.compress(finder.dumps().encode("utf-8"), 1)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as out:
+                out.write(data)
+            with self._lock:
+                previous = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp_path, path)
+                self._stored(path, previous)
+        except OSError:
+            pass  # Only costs a rebuild next time
+
+
+finder_store = PathFinderStore(FINDER_CACHE_DIR, FINDER_CACHE_MAX_BYTES)
+
+
+ZIP_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")  # Ends with the name and extra field lengths
+ZIP_LOCAL_SIGNATURE = 0x04034b50
+
+
+def archive_member_path(member):
+    """Repository path of a zipball file, or None for folders and anything outside the "<owner>-<repo>-<sha>/" folder."""
+    if member.is_dir():
+        return None
+    path = member.filename.partition("/")[2]
+    return path or None
+
+
+class ArchiveSnapshot:
+    """A downloaded zipball registered so its repository can be browsed and read offline.
+
+    Indexing reads the central directory once and hashes every member, so the
+    snapshot knows each file's git blob SHA and where its compressed bytes
+    sit in the zip. Opening a file is then one seek, with no need to parse the
+    archive again.
+    """
+
+    def __init__(self, repo_name, commit_sha, zip_path, zip_stat, files):
+        self.repo_name = repo_name
+        self.commit_sha = commit_sha
+        self.zip_path = zip_path
+        self.zip_stat = zip_stat  # [size, mtime_ns] when indexed; anything else means the zip was replaced
+        self.files = files        # path -> [blob sha, size, local header offset, compressed size, method, CRC-32]
+        self._by_sha = {entry[0]: path for path, entry in files.items()}
+
+    @staticmethod
+    def _stat(zip_path):
+        st = os.stat(zip_path)
+        return [st.st_size, st.st_mtime_ns]
+
+    @classmethod
+    def index(cls, repo_name, commit_sha, zip_path, check_cancelled=lambda: None):
+        files = {}
+        with zipfile.ZipFile(zip_path) as archive:
+            for member in archive.infolist():
+                path = archive_member_path(member)
+                if path is None:
+                    continue
+                check_cancelled()
+                digest = hashlib.sha1(b"blob %d\0" % member.file_size)
+                with archive.open(member) as src:
+                    while chunk := src.read(DOWNLOAD_CHUNK_SIZE):
+                        digest.update(chunk)
+                files[path] = [digest.hexdigest(), member.file_size, member.header_offset,
+                               member.compress_size, member.compress_type, member.CRC]
+        return cls(repo_name, commit_sha, os.path.abspath(zip_path), cls._stat(zip_path), files)
+
+    def is_current(self):
+        """Whether the zip is still where it was indexed, unchanged."""
+        try:
+            return self._stat(self.zip_path) == self.zip_stat
+        except OSError:
+            return False
+
+    def has(self, sha):
+        return sha in self._by_sha
+
+    def tree_index(self):
+        """The RepoTreeIndex of the snapshot's commit, built without the network."""
+        entries, dirs = [], set()
+        for path, (sha, size, *_) in self.files.items():
+            entries.append((path, GitTreeEntry("blob", size, sha)))
+            parent = path.rpartition("/")[0]
+            while parent and parent not in dirs:
+                dirs.add(parent)
+                parent = parent.rpartition("/")[0]
+        # A zip records no tree SHAs, as for directories added by RepoTreeIndex.apply
+        entries += [(path, GitTreeEntry("tree", 0, None)) for path in dirs]
+        return RepoTreeIndex(self.commit_sha, entries, from_archive=True)
+
+    def extract(self, sha, dest_path):
+        """Write the blob with this SHA to dest_path; False if the snapshot cannot provide it."""
+        path = self._by_sha.get(sha)
+        if path is None:
+            return False
+        _, _, offset, compressed_size, method, crc = self.files[path]
+        if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            return False
+        try:
+            if self._copy_member(offset, compressed_size, method, dest_path) == crc:
+                return True
+        except (OSError, struct.error, zlib.error):
+            pass
+        try:
+            os.remove(dest_path)  # Partial or damaged output; the caller falls back to the network
+        except OSError:
+            pass
+        return False
+
+    def _copy_member(self, offset, compressed_size, method, dest_path):
+        """Inflate the member whose local header is at offset into dest_path; return its CRC-32, or None."""
+        with open(self.zip_path, "rb") as src, open(dest_path, "wb") as out:
+            src.seek(offset)
+            header = ZIP_LOCAL_HEADER.unpack(src.read(ZIP_LOCAL_HEADER.size))
+            if header[0] != ZIP_LOCAL_SIGNATURE:
+                return None
+            src.seek(header[-2] + header[-1], os.SEEK_CUR)
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == zipfile.ZIP_DEFLATED else None
+            remaining, check = compressed_size, 0
+            while remaining:
+                chunk = src.read(min(remaining, DOWNLOAD_CHUNK_SIZE))
+                if not chunk:
+                    return None
+                remaining -= len(chunk)
+                data = decompressor.decompress(chunk) if decompressor else chunk
+                check = zlib.crc32(data, check)
+                out.write(data)
+            if decompressor:
+                data = decompressor.flush()
+                check = zlib.crc32(data, check)
+                out.write(data)
+        return check
+
+    def save(self, path):
+        data = json.dumps({"repo": self.repo_name, "commit": self.commit_sha, "zip": self.zip_path,
+                           "zip_stat": self.zip_stat, "files": self.files})
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(zlib.compress(data.encode("utf-8"), 1))
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = json.loads(zlib.decompress(f.read()))
+        return cls(data["repo"], data["commit"], data["zip"], data["zip_stat"], data["files"])
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps({
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "op": getattr(record, "op", None),
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }, ensure_ascii=False)
+
+
+def make_operation_logger(path):
+    """Logger writing JSON lines to a size-rotated file."""
+    logger = logging.getLogger("github_app")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        try:
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+        except OSError:
+            handler = logging.NullHandler()  # Read-only directory: keep the GUI log only
+        handler.setFormatter(JsonLinesFormatter())
+        logger.addHandler(handler)
+    return logger
+
+
+def token_fingerprint(token):
+    """Identifies which token a cache file belongs to without storing the token."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def format_size(size_bytes):
+    if size_bytes == 0:
+        return "0 B"
+    size_name = ("B", "KB", "MB", "GB", "TB")
+    import math
+    i = int(math.floor(math.log(size_bytes, 1024)))
+    p = math.pow(1024, i)
+    s = round(size_bytes / p, 2)
+    return f"{s} {size_name[i]}"
+
+
+class GithubCore:
+    """A logged-in GitHub session and every operation the app performs with it.
+
+    Methods raise on failure. log(message) receives status lines,
+    progress(text, fraction) transfer progress (fraction is None when the
+    total is unknown), and check_cancelled() is called between units of work
+    and may raise TaskCancelled.
+    """
+
+    def __init__(self, log=None, progress=None, check_cancelled=None):
+        self.log = log or (lambda message: None)
+        self.progress = progress or (lambda text, fraction=None: None)
+        self.check_cancelled = check_cancelled or (lambda: None)
+        self.github_api = None
+        self.user = None
+        self.token = None
+        self.tree_indexes = {}  # repo full name -> RepoTreeIndex of its default branch HEAD
+        self.path_finders = {}  # repo full name -> PathFinder of the last tree index it was asked for
+        self.snapshots = {}     # repo full name -> ArchiveSnapshot, or None once known to have none
+        self._snapshot_lock = threading.Lock()
+        self._repo_list_lock = threading.Lock()  # Batch deletes update the cached list concurrently
+
+    # --- Session ---
+
+    def login(self, token, base_url=None):
+        """Authenticate with a personal access token and return the user's login.
+
+        base_url selects another API server (GitHub Enterprise, the benchmark mock).
+        """
+        from github_transport import make_github_client
+        try:
+            self.github_api = make_github_client(token, base_url)
+            self.user = self.github_api.get_user()
+            login = self.user.login  # This call will fail if the token is invalid
+        except Exception:
+            self.github_api = None
+            self.user = None
+            raise
+        self.token = token
+        self.tree_indexes.clear()
+        self.path_finders.clear()
+        return login
+
+    def list_repos(self, on_update=None):
+        """Return the full names of every repository the user can access, sorted.
+
+        on_update(names) is called with the sorted names seen so far as pages arrive.
+        """
+        if not self.user:
+            raise RuntimeError("Not logged in.")
+        requester = self.github_api.requester
+        on_update = on_update or (lambda names: None)
+
+        def fetch_page(page):
+            headers, data = requester.requestJsonAndCheck(
+                "GET", "/user/repos", parameters={"per_page": REPO_PAGE_SIZE, "page": page})
+            return headers, [repo["full_name"] for repo in data]
+
+        headers, names = fetch_page(1)
+        repo_names = set(names)
+        on_update(sorted(repo_names))
+        match = re.search(r'[?&]page=(\d+)[^>]*>;\s*rel="last"', headers.get("link", ""))
+        last_page = int(match.group(1)) if match else 1
+
+        # The Link header tells us how many pages there are, so fetch the rest side by side
+        with ThreadPoolExecutor(max_workers=REPO_LIST_WORKERS) as pool:
+            for future in as_completed([submit_in_context(pool, fetch_page, page) for page in range(2, last_page + 1)]):
+                repo_names.update(future.result()[1])
+                on_update(sorted(repo_names))
+
+        repo_names = sorted(repo_names)
+        self._save_cached_repo_list(repo_names)
+        return repo_names
+
+    def cached_repo_list(self, token):
+        """The last repository list fetched with this token, or None."""
+        try:
+            with open(REPO_LIST_CACHE, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("token") == token_fingerprint(token):
+            return cached["repos"]
+        return None
+
+    def _update_cached_repo_list(self, added=(), removed=()):
+        """Apply a repository we created or deleted to the cached list; the next list_repos confirms it."""
+        with self._repo_list_lock:
+            repo_names = self.cached_repo_list(self.token)
+            if repo_names is not None:
+                self._save_cached_repo_list(sorted(set(repo_names).union(added).difference(removed)))
+
+    def _save_cached_repo_list(self, repo_names):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(REPO_LIST_CACHE, "w", encoding="utf-8") as f:
+                json.dump({"token": token_fingerprint(self.token), "repos": repo_names}, f)
+        except OSError as e:
+            self.log(f"⚠️ Could not save the repository list cache: {e}")
+
+    def connection_stats(self):
+        """(connections opened, requests sent) over the shared HTTP pool; (0, 0) before the first login."""
+        if self.github_api is None:
+            return 0, 0
+        from github_transport import pool_stats
+        return pool_stats()
+
+    # --- Browsing ---
+
+    def load_tree_index(self, repo_name):
+        """Return the tree index for the repo's HEAD, rebuilding it only when HEAD has moved.
+
+        An index browsed offline from a snapshot is replaced by the real tree
+        once GitHub is reachable.
+        """
+        if not self.user:
+            raise RuntimeError("Not logged in.")
+        repo = self.github_api.get_repo(repo_name)
+        head = repo.get_branch(repo.default_branch).commit
+        index = self.tree_indexes.get(repo_name)
+        if index is not None and index.commit_sha == head.sha and not index.from_archive:
+            return index
+
+        started = time.monotonic()
+        index = RepoTreeIndex(head.sha, self.walk_git_tree(repo, head.commit.tree.sha))
+        self.tree_indexes[repo_name] = index
+        self.path_finders.pop(repo_name, None)  # May have been built from a snapshot's partial index
+        self.log(f"   - Indexed {len(index)} paths at {head.sha[:7]} in {time.monotonic() - started:.1f}s.")
+        return index
+
+    def offline_tree_index(self, repo_name):
+        """The tree index to browse with when GitHub cannot be reached: the one in memory, else the snapshot's."""
+        index = self.tree_indexes.get(repo_name)
+        if index is None:
+            snapshot = self.snapshot(repo_name)
+            if snapshot is None:
+                return None
+            index = self.tree_indexes[repo_name] = snapshot.tree_index()
+        return index
+
+    def path_finder(self, repo_name):
+        """Return the "Go to file" index of the repo's tree index, loading or building it for that commit."""
+        index = self.tree_indexes.get(repo_name) or self.load_tree_index(repo_name)
+        finder = self.path_finders.get(repo_name)
+        if finder is not None and finder.commit_sha == index.commit_sha:
+            return finder
+
+        commit_sha = index.commit_sha
+        # The store keeps one finder per commit, so only a complete tree may fill it
+        finder = None if index.from_archive else finder_store.load(commit_sha)
+        if finder is None:
+            started = time.monotonic()
+            finder = PathFinder(commit_sha, index.file_paths())
+            if not index.from_archive:
+                finder_store.save(finder)
+            self.log(f"   - Indexed {len(finder)} file names at {commit_sha[:7]} in {time.monotonic() - started:.1f}s.")
+        self.path_finders[repo_name] = finder
+        return finder
+
+    def fetch_blob(self, repo_name, sha, dest_path, progress=True, stop_if=None):
+        """Write a blob to dest_path from the blob cache, a downloaded snapshot or the raw blob endpoint.
+
+        Returns True when no network was needed. stop_if is passed on to
+        stream_to_file, so a download may end after its first bytes.
+        """
+        if blob_store.extract(sha, dest_path):
+            return True
+        # Blobs are content-addressed, so even a stale snapshot serves every file that has not changed since
+        snapshot = self.snapshot(repo_name)
+        if snapshot is not None and snapshot.extract(sha, dest_path):
+            return True
+        # The raw blob endpoint has no 1 MB limit, unlike the Contents API, and lets us stream to disk.
+        # dest_path may hold a local source's partial output, which is not a prefix worth resuming.
+        url = f"{self.github_api.requester.base_url}/repos/{repo_name}/git/blobs/{sha}"
+        self.stream_to_file(url, dest_path, headers={
+            "Authorization": f"token {self.token}", "Accept": "application/vnd.github.raw"}, progress=progress,
+            metered=True, resume=False, stop_if=stop_if)
+        return False
+
+    def prefetch_blobs(self, repo_name, paths, max_files=PREFETCH_MAX_FILES):
+        """Warm the blob cache with files from the tree index that are likely to be opened next.
+
+        Skips files that are cached or larger than PREFETCH_MAX_BYTES and stops
+        when the rate-limit budget runs low. Returns how many files were fetched.
+        """
+        index = self.tree_indexes.get(repo_name)
+        if index is None:
+            return 0
+        snapshot = self.snapshot(repo_name)
+        fetched = 0
+        for path in paths:
+            if fetched >= max_files or not rate_governor.has_budget(PREFETCH_RESERVE):
+                break
+            self.check_cancelled()
+            item = index.get(path)
+            if item is None or item.type != "file" or item.size > PREFETCH_MAX_BYTES or blob_store.has(item.sha):
+                continue
+            if snapshot is not None and snapshot.has(item.sha):
+                continue
+            fd, part_path = tempfile.mkstemp(prefix="github_prefetch_", suffix=".blob")
+            os.close(fd)
+            try:
+                self.fetch_blob(repo_name, item.sha, part_path, progress=False)
+                blob_store.add_file(item.sha, part_path)
+            finally:
+                os.remove(part_path)
+            fetched += 1
+        return fetched
+
+    def save_file(self, repo_name, path, sha, new_content):
+        """Commit new text content for a file and return its new blob SHA."""
+        repo = self.github_api.get_repo(repo_name)
+        result = repo.update_file(
+            path=path,
+            message=f"docs: update {os.path.basename(path)} via GUI",
+            content=new_content,
+            sha=sha
+        )
+        data = new_content.encode("utf-8")
+        # Reopening the file straight after saving it should not need the network
+        blob_store.add_bytes(result["content"].sha, data)
+        commit = result["commit"]
+        self._update_tree_index(repo_name, commit.parents[0].sha, commit.sha, {path: (result["content"].sha, len(data))})
+        return result["content"].sha
+
+    def _update_tree_index(self, repo_name, parent_sha, commit_sha, changes):
+        """Write a commit we just made through to the cached tree index instead of re-reading the tree.
+
+        The index follows only if it was built on the commit's parent; otherwise
+        it is dropped and the next browse rebuilds it.
+        """
+        index = self.tree_indexes.get(repo_name)
+        if index is None:
+            return
+        if index.commit_sha != parent_sha:
+            self.tree_indexes.pop(repo_name, None)
+            return
+        index.apply(commit_sha, changes)
+
+    # --- Downloads ---
+
+    def download_archive(self, repo_name, save_path, snapshot=False):
+        """Download the default branch as a zipball; with snapshot, register it for offline browsing."""
+        repo = self.github_api.get_repo(repo_name)
+        # Pin the archive to a commit so a partial download can be resumed safely.
+        sha = repo.get_branch(repo.default_branch).commit.sha
+        part_path = f"{save_path}.{sha[:12]}.part"
+        for stale in glob.glob(glob.escape(save_path) + ".*.part"):
+            if stale != part_path: os.remove(stale)
+
+        zip_url = repo.get_archive_link("zipball", ref=sha)
+        self.log(f"⬇️ Downloading from {zip_url}...")
+        self.stream_to_file(zip_url, part_path)
+        os.replace(part_path, save_path)
+        if snapshot:
+            self.register_snapshot(repo_name, save_path, sha)
+
+    # --- Snapshots ---
+
+    def _snapshot_index_path(self, repo_name):
+        return os.path.join(SNAPSHOT_DIR, hashlib.sha256(repo_name.encode()).hexdigest()[:16] + ".json.z")
+
+    def register_snapshot(self, repo_name, zip_path, commit_sha):
+        """Index a zipball of repo_name at commit_sha so browsing and file reads can be served from it."""
+        self.progress("Indexing the archive for offline browsing...")
+        snapshot = ArchiveSnapshot.index(repo_name, commit_sha, zip_path, self.check_cancelled)
+        try:
+            snapshot.save(self._snapshot_index_path(repo_name))
+        except OSError as e:
+            self.log(f"⚠️ Could not save the archive index: {e}")
+        with self._snapshot_lock:
+            self.snapshots[repo_name] = snapshot
+        self.log(f"📦 Indexed {len(snapshot.files)} files at {commit_sha[:7]}; '{repo_name}' can now be browsed offline.")
+        return snapshot
+
+    def has_snapshot(self, repo_name):
+        """Cheap check, without loading the index, for whether repo_name may have a snapshot."""
+        if repo_name in self.snapshots:
+            return self.snapshots[repo_name] is not None
+        return os.path.exists(self._snapshot_index_path(repo_name))
+
+    def snapshot(self, repo_name):
+        """The registered snapshot of repo_name, or None; a snapshot whose zip was moved or changed is dropped."""
+        with self._snapshot_lock:
+            if repo_name in self.snapshots:
+                snapshot = self.snapshots[repo_name]
+            else:
+                try:
+                    snapshot = ArchiveSnapshot.load(self._snapshot_index_path(repo_name))
+                except (OSError, ValueError, KeyError, zlib.error):
+                    snapshot = None
+            if snapshot is not None and not snapshot.is_current():
+                snapshot = None
+                try:
+                    os.remove(self._snapshot_index_path(repo_name))
+                except OSError:
+                    pass
+            self.snapshots[repo_name] = snapshot
+        return snapshot
+
+    def stream_to_file(self, url, part_path, headers=None, progress=True, metered=False, resume=True, stop_if=None):
+        """Stream url into part_path in chunks, resuming an earlier partial file with a Range request.
+
+        metered requests count against the API rate limit and go through the
+        governor; archive downloads from codeload are not metered. With
+        resume=False, whatever is already in part_path is overwritten.
+        stop_if(head) sees the first BINARY_SNIFF_BYTES of the body and can
+        end the transfer there by returning True.
+        """
+        from github_transport import http_session
+        offset = os.path.getsize(part_path) if resume and os.path.exists(part_path) else 0
+        headers = dict(headers or {})
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["Accept-Encoding"] = "identity"  # The range must count the decoded bytes already on disk
+        request_started, response, received = time.perf_counter(), None, offset
+        try:
+            if metered:
+                response = governed_request(http_session, "GET", url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT)
+            else:
+                response = http_session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT)
+            with response:
+                if response.status_code == 416:  # Nothing left to fetch: the part file is already complete.
+                    return
+                response.raise_for_status()
+                if offset and response.status_code == 206:
+                    self.log(f"   - Resuming at {format_size(offset)}.")
+                elif offset:
+                    self.log("   - Server does not support resuming, starting over.")
+                    offset = 0
+
+                # A compressed body's Content-Length does not match the decoded bytes counted below
+                length = None if response.headers.get("Content-Encoding") else response.headers.get("Content-Length")
+                total = offset + int(length) if length else None
+                received, started, last_update = offset, time.monotonic(), 0.0
+                head = b"" if stop_if and not offset else None
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        self.check_cancelled()  # The part file is kept, so a retry resumes
+                        f.write(chunk)
+                        received += len(chunk)
+                        if head is not None:
+                            head += chunk[:BINARY_SNIFF_BYTES - len(head)]
+                            if len(head) >= BINARY_SNIFF_BYTES:
+                                if stop_if(head):
+                                    return
+                                head = None
+                        now = time.monotonic()
+                        if progress and now - last_update >= PROGRESS_INTERVAL:
+                            last_update = now
+                            self._report_transfer(received, total, offset, now - started)
+        finally:
+            if not metered:  # governed_request() has recorded the metered ones
+                request_metrics.record(
+                    "GET", url, response.status_code if response is not None else None, time.perf_counter() - request_started,
+                    received=received - offset, rate_cost=int(response is not None and "X-RateLimit-Remaining" in response.headers))
+
+    def _report_transfer(self, received, total, offset, elapsed):
+        rate = (received - offset) / elapsed if elapsed > 0 else 0
+        text = f"{format_size(received)}"
+        if total:
+            text += f" / {format_size(total)}"
+        text += f" at {format_size(int(rate))}/s"
+        if total and rate:
+            eta = int((total - received) / rate)
+            text += f", ETA {eta // 60}:{eta % 60:02d}"
+        self.progress(text, received / total if total else None)
+
+    # --- Incremental Mirror ---
+
+    def sync_mirror(self, repo_name, dest_dir):
+        """Bring dest_dir up to date with the default branch of repo_name.
+
+        The first sync extracts a zipball; later syncs diff the branch tree
+        against the file list saved with the last synced commit and only fetch
+        changed blobs and remove deleted files.
+        """
+        state = self._load_mirror_state(dest_dir)
+        if state and state["repo"] != repo_name:
+            raise ValueError(f"the folder already mirrors '{state['repo']}'")
+
+        repo = self.github_api.get_repo(repo_name)
+        head_sha = repo.get_branch(repo.default_branch).commit.sha
+        if state and state["commit"] == head_sha:
+            self.log(f"✅ Mirror of '{repo_name}' is already at {head_sha[:7]}.")
+            return
+
+        head_tree = repo.get_git_commit(head_sha).tree.sha
+        files = {path: (e.sha, e.mode) for path, e in self.walk_git_tree(repo, head_tree) if e.type == "blob"}
+        if state:
+            known = {path: tuple(value) for path, value in state["files"].items()}
+            removed = [path for path in known if path not in files]
+            changed = [path for path, value in files.items() if known.get(path) != value]
+            self.log(f"   - {state['commit'][:7]}..{head_sha[:7]}: {len(changed)} changed, {len(removed)} removed.")
+            for path in removed:
+                self._remove_mirror_file(dest_dir, path)
+            self._fetch_mirror_files(repo_name, dest_dir, {path: files[path] for path in changed})
+        else:
+            extracted = self._extract_mirror_archive(repo, head_sha, dest_dir, files)
+            # export-ignore leaves files out of the archive and export-subst rewrites them; fetch those as blobs
+            missing = {path: value for path, value in files.items() if extracted.get(path) != value[0]}
+            if missing:
+                self.log(f"   - {len(missing)} files are missing or different in the archive, fetching them.")
+                self._fetch_mirror_files(repo_name, dest_dir, missing)
+
+        self._save_mirror_state(dest_dir, {"repo": repo_name, "commit": head_sha,
+                                           "files": {path: list(value) for path, value in files.items()}})
+        self.log(f"✅ Mirror of '{repo_name}' is now at {head_sha[:7]}.")
+
+    def _load_mirror_state(self, dest_dir):
+        try:
+            with open(os.path.join(dest_dir, MIRROR_STATE_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save_mirror_state(self, dest_dir, state):
+        state_path = os.path.join(dest_dir, MIRROR_STATE_FILE)
+        with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(state_path + ".tmp", state_path)
+
+    def _mirror_path(self, dest_dir, path):
+        """Local path for a repository path, refusing anything that escapes dest_dir."""
+        root = os.path.realpath(dest_dir)
+        parts = path.split("/")
+        # Resolve only the parent so that a mirrored symlink is itself replaced, not followed.
+        parent = os.path.realpath(os.path.join(root, *parts[:-1]))
+        if os.path.commonpath([root, parent]) != root or parts[-1] in ("", ".", ".."):
+            raise ValueError(f"unsafe path in repository: {path!r}")
+        return os.path.join(parent, parts[-1])
+
+    def _extract_mirror_archive(self, repo, sha, dest_dir, files):
+        """First sync: download the zipball for sha and unpack it into dest_dir; returns {path: blob sha} of what it wrote."""
+        fd, zip_path = tempfile.mkstemp(prefix="github_app_", suffix=".zip")
+        os.close(fd)
+        try:
+            zip_url = repo.get_archive_link("zipball", ref=sha)
+            self.log(f"⬇️ First sync, downloading the full archive from {zip_url}...")
+            self.stream_to_file(zip_url, zip_path)
+            extracted = {}
+            with zipfile.ZipFile(zip_path) as archive:
+                members = [(m, path) for m in archive.infolist() if (path := archive_member_path(m)) is not None]
+                for done, (member, path) in enumerate(members, start=1):
+                    self.check_cancelled()
+                    _, mode = files.get(path, (None, "100644"))
+                    target = self._mirror_path(dest_dir, path)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    digest = hashlib.sha1(b"blob %d\0" % member.file_size)
+                    with archive.open(member) as src, open(target + ".part", "wb") as dst:
+                        while chunk := src.read(DOWNLOAD_CHUNK_SIZE):
+                            digest.update(chunk)
+                            dst.write(chunk)
+                    extracted[path] = digest.hexdigest()
+                    self._place_mirror_file(target + ".part", target, mode)
+                    self.progress(f"Extracting {done}/{len(members)} files", done / len(members))
+            return extracted
+        finally:
+            os.remove(zip_path)
+
+    def _fetch_mirror_files(self, repo_name, dest_dir, files):
+        """Download {path: (blob_sha, mode)} into dest_dir concurrently."""
+        def fetch(path, sha, mode):
+            target = self._mirror_path(dest_dir, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if os.path.exists(target + ".part"): os.remove(target + ".part")
+            self.fetch_blob(repo_name, sha, target + ".part", progress=False)
+            self._place_mirror_file(target + ".part", target, mode)
+
+        total = len(files)
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+            futures = {submit_in_context(pool, fetch, path, sha, mode): path for path, (sha, mode) in files.items()}
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    self.check_cancelled()
+                except TaskCancelled:
+                    pool.shutdown(cancel_futures=True)
+                    raise
+                # A missing file would be skipped forever once the new commit is recorded.
+                future.result()
+                self.log(f"   -> [{done}/{total}] Updated {futures[future]}")
+                self.progress(f"Fetching {done}/{total} files", done / total)
+
+    def _place_mirror_file(self, part_path, target, mode):
+        """Move a downloaded file into place, honouring executable and symlink modes."""
+        if os.path.isdir(target) and not os.path.islink(target):
+            shutil.rmtree(target)
+        if mode == "120000":
+            with open(part_path, encoding="utf-8", errors="surrogateescape") as f:
+                link_target = f.read()
+            try:
+                if os.path.lexists(target): os.remove(target)
+                os.symlink(link_target, target)
+                os.remove(part_path)
+                return
+            except OSError:
+                pass  # No symlink support (e.g. Windows without privileges): keep the link text as a file, like git does
+        elif mode == "100755":
+            os.chmod(part_path, os.stat(part_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        os.replace(part_path, target)
+
+    def _remove_mirror_file(self, dest_dir, path):
+        """Delete a file that left the repository, then prune directories it leaves empty."""
+        target = self._mirror_path(dest_dir, path)
+        if os.path.lexists(target):
+            os.remove(target)
+        root = os.path.realpath(dest_dir)
+        parent = os.path.dirname(target)
+        while parent != root and os.path.isdir(parent) and not os.listdir(parent):
+            os.rmdir(parent)
+            parent = os.path.dirname(parent)
+
+    # --- Repositories ---
+
+    def create_repo(self, name, desc="", private=True, auto_init=True, gitignore="", license_key=""):
+        """Create a repository for the logged-in user and return its full name."""
+        # PyGithub rejects None for the templates; leave them out instead
+        templates = {k: v for k, v in (("gitignore_template", gitignore), ("license_template", license_key)) if v}
+        repo = self.user.create_repo(name=name, description=desc, private=private, auto_init=auto_init, **templates)
+        self._update_cached_repo_list(added=[repo.full_name])
+        return repo.full_name
+
+    def delete_repo(self, repo_name):
+        self.github_api.get_repo(repo_name).delete()
+        self.tree_indexes.pop(repo_name, None)
+        self.path_finders.pop(repo_name, None)
+        self._update_cached_repo_list(removed=[repo_name])
+
+    # --- Uploads ---
+
+    def upload_file(self, repo_name, local_path, remote_path):
+        """Create or update one file, skipping the upload if GitHub already has the same content."""
+        from github import GithubException
+        repo = self.github_api.get_repo(repo_name)
+        try:
+            head = repo.get_branch(repo.default_branch).commit
+            existing = self.find_tree_entry(repo, head.commit.tree.sha, remote_path)
+        except GithubException as e:
+            if e.status not in (404, 409): raise  # 404/409: the repository is still empty
+            existing = None
+        if not self._check_file_sizes([local_path]):
+            raise ValueError(f"'{local_path}' is too large for GitHub.")
+        if existing is not None and existing.sha == git_blob_sha(local_path):
+            self.log(f"✅ '{remote_path}' is already up to date, nothing to upload.")
+            return
+
+        if existing is not None:
+            result = self._put_file(repo, remote_path, local_path, f"feat: update {os.path.basename(remote_path)}", sha=existing.sha)
+            self.log(f"✅ Successfully updated file: {remote_path}")
+        else:
+            result = self._put_file(repo, remote_path, local_path, f"feat: add {os.path.basename(remote_path)}")
+            self.log(f"✅ Successfully created file: {remote_path}")
+        parents = result["commit"]["parents"]
+        if parents:
+            self._update_tree_index(repo_name, parents[0]["sha"], result["commit"]["sha"],
+                                    {remote_path: (result["content"]["sha"], os.path.getsize(local_path))})
+
+    def upload_folder(self, repo_name, local_folder, remote_base_path, delete_missing=False):
+        """Upload only what differs from the remote folder, as a single commit.
+
+        With delete_missing, remote files that have no local counterpart are
+        removed too, making the remote folder a mirror of the local one.
+        """
+        from github import GithubException, InputGitTreeElement
+        remote_base_path = remote_base_path.replace("\\", "/").strip("/")
+        repo = self.github_api.get_repo(repo_name)
+        files = []
+        # The app keeps its cache, log and token in the working directory; none of them may be committed
+        cache_dir, log_file = os.path.realpath(CACHE_DIR), os.path.realpath(LOG_FILE)
+        private_files = {os.path.realpath(TOKEN_FILE), log_file}
+        for root, dirs, names in os.walk(local_folder):
+            dirs[:] = [d for d in dirs if d != ".git" and os.path.realpath(os.path.join(root, d)) != cache_dir]
+            for name in names:
+                local_path = os.path.join(root, name)
+                real_path = os.path.realpath(local_path)
+                if name == MIRROR_STATE_FILE or real_path in private_files or real_path.startswith(log_file + "."):
+                    continue
+                relative_path = os.path.relpath(local_path, local_folder)
+                remote_path = os.path.join(remote_base_path, relative_path).replace("\\", "/").lstrip("/")
+                files.append((local_path, remote_path))
+        if not files and not delete_missing:
+            self.log("⚠️ Folder is empty, nothing to upload."); return
+
+        if not self._check_file_sizes([local_path for local_path, _ in files]):
+            raise ValueError("some files are too large for GitHub, nothing was uploaded.")
+
+        files.sort(key=lambda f: f[1])
+        try:
+            head_commit = repo.get_git_commit(repo.get_git_ref(f"heads/{repo.default_branch}").object.sha)
+        except GithubException as e:
+            if e.status != 409 or not files: raise
+            # The Git Data API refuses to work on an empty repository; seed it with the first file.
+            local_path, remote_path = files.pop(0)
+            self.log(f"   - Repository is empty, creating '{remote_path}' to initialise it...")
+            self._put_file(repo, remote_path, local_path, f"feat: add {os.path.basename(remote_path)}")
+            if not files:
+                self.log("✅ Folder upload process complete."); return
+            head_commit = repo.get_git_commit(repo.get_git_ref(f"heads/{repo.default_branch}").object.sha)
+
+        remote = self._remote_blobs(repo, head_commit.tree.sha, remote_base_path)
+        self.log(f"   - Hashing {len(files)} local files...")
+        local_shas = self._hash_files([local_path for local_path, _ in files])
+
+        known_blobs = {e.sha for e in remote.values()}
+        to_upload, elements, unchanged, changes = [], [], 0, {}
+        for (local_path, remote_path), sha in zip(files, local_shas):
+            mode = self._file_mode(local_path)
+            current = remote.get(remote_path)
+            if current is not None and current.sha == sha and current.mode == mode:
+                unchanged += 1
+                continue
+            changes[remote_path] = (sha, os.path.getsize(local_path))
+            if sha in known_blobs:
+                # GitHub already has this exact content (e.g. a renamed file): reference it, no upload needed.
+                elements.append(InputGitTreeElement(remote_path, mode, "blob", sha=sha))
+            else:
+                to_upload.append((local_path, remote_path))
+        local_paths = {remote_path for _, remote_path in files}
+        removed = [path for path, e in remote.items() if delete_missing and path not in local_paths]
+        changed = len(files) - unchanged
+        self.log(f"   - {changed} new or modified, {unchanged} unchanged, {len(removed)} to delete.")
+        if not changed and not removed:
+            self.log("✅ Remote folder is already up to date."); return
+
+        uploaded = self._create_blobs(repo, to_upload)
+        if len(uploaded) < len(to_upload):
+            raise RuntimeError(f"{len(to_upload) - len(uploaded)} file(s) failed, nothing was committed.")
+        elements += uploaded
+        elements += [InputGitTreeElement(path, remote[path].mode, "blob", sha=None) for path in removed]
+        changes.update(dict.fromkeys(removed))
+
+        folder_name = os.path.basename(os.path.normpath(local_folder))
+        verb = "sync" if delete_missing else "upload"
+        commit = self._commit_tree_changes(repo, lambda head: elements, f"feat: {verb} {folder_name} ({changed} changed, {len(removed)} removed)")
+        self._update_tree_index(repo_name, commit.parents[0].sha, commit.sha, changes)
+        self.log(f"✅ Committed {changed} changed and {len(removed)} removed files in {commit.sha[:7]} ({len(to_upload)} blobs uploaded).")
+
+    def _remote_blobs(self, repo, root_tree_sha, base_path):
+        """Map every file path under base_path to its GitTreeElement, read with one recursive tree call."""
+        if base_path:
+            entry = self.find_tree_entry(repo, root_tree_sha, base_path)
+            if entry is None or entry.type != "tree":
+                return {}
+            entries = self.walk_git_tree(repo, entry.sha, base_path)
+        else:
+            entries = self.walk_git_tree(repo, root_tree_sha)
+        return {path: e for path, e in entries if e.type == "blob"}
+
+    def _hash_files(self, paths):
+        """Git blob SHAs of local files, computed in a process pool for large trees."""
+        if len(paths) < HASH_POOL_THRESHOLD:
+            return [git_blob_sha(path) for path in paths]
+        # spawn, not fork: forking a process that runs Tk and worker threads is not safe
+        with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as pool:
+            return list(pool.map(git_blob_sha, paths, chunksize=64))
+
+    def _file_mode(self, local_path):
+        return "100755" if os.access(local_path, os.X_OK) and os.name != "nt" else "100644"
+
+    def _send_file(self, verb, url, local_path, fields):
+        """Send a file as a base64 JSON body streamed from disk, returning the decoded JSON response."""
+        from github import GithubException
+        from github_transport import http_session
+        body = Base64JsonBody(local_path, fields)
+        try:
+            with upload_budget.reserve(body.size):
+                response = governed_request(http_session, verb, url, data=body, timeout=DOWNLOAD_TIMEOUT, headers={
+                    "Authorization": f"token {self.token}",
+                    "Accept": "application/vnd.github+json",
+                    "Content-Type": "application/json",
+                })
+        finally:
+            body.close()
+        if response.status_code >= 400:
+            try:
+                data = response.json()
+            except ValueError:
+                data = response.text
+            raise GithubException(response.status_code, data, dict(response.headers))
+        return response.json()
+
+    def _put_file(self, repo, remote_path, local_path, message, sha=None):
+        """Create or update a file through the Contents API without loading it into memory."""
+        fields = {"message": message}
+        if sha: fields["sha"] = sha
+        url = f"{repo.url}/contents/{urllib.parse.quote(remote_path)}"
+        return self._send_file("PUT", url, local_path, fields)
+
+    def _check_file_sizes(self, local_paths):
+        """Log and return False if any file is too large for GitHub, before anything is sent."""
+        too_large = [p for p in local_paths if os.path.getsize(p) > MAX_FILE_BYTES]
+        for path in too_large[:10]:
+            self.log(f"   - ❌ '{path}' is {format_size(os.path.getsize(path))}; GitHub rejects files over {format_size(MAX_FILE_BYTES)} (use Git LFS).")
+        if len(too_large) > 10:
+            self.log(f"   - ... and {len(too_large) - 10} more.")
+        for path in local_paths:
+            if LARGE_FILE_BYTES < os.path.getsize(path) <= MAX_FILE_BYTES:
+                self.log(f"   - ⚠️ '{path}' is over {format_size(LARGE_FILE_BYTES)}; GitHub recommends Git LFS for files this large.")
+        return not too_large
+
+    def _create_blobs(self, repo, files):
+        """Upload (local_path, remote_path) pairs as git blobs concurrently, returning tree elements."""
+        from github import InputGitTreeElement
+        def create_blob(local_path):
+            return self._send_file("POST", f"{repo.url}/git/blobs", local_path, {"encoding": "base64"})["sha"]
+
+        elements, total = [], len(files)
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            futures = {submit_in_context(pool, create_blob, local_path): (local_path, remote_path) for local_path, remote_path in files}
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    self.check_cancelled()
+                except TaskCancelled:
+                    pool.shutdown(cancel_futures=True)
+                    raise
+                local_path, remote_path = futures[future]
+                try:
+                    sha = future.result()
+                except Exception as e:
+                    self.log(f"   - ❌ [{done}/{total}] Failed to upload '{local_path}': {e}")
+                    continue
+                elements.append(InputGitTreeElement(remote_path, self._file_mode(local_path), "blob", sha=sha))
+                self.log(f"   -> [{done}/{total}] Uploaded {remote_path}")
+        return elements
+
+    def _commit_tree_changes(self, repo, build_elements, message):
+        """Commit a tree built on the default branch head and move the branch once.
+
+        build_elements(head_commit) returns the InputGitTreeElements to apply;
+        it is called again if the branch moves before the ref update lands.
+        """
+        from github import GithubException
+        branch = repo.default_branch
+        for attempt in range(1, MAX_REF_UPDATE_RETRIES + 1):
+            ref = repo.get_git_ref(f"heads/{branch}")
+            head_commit = repo.get_git_commit(ref.object.sha)
+            tree = repo.create_git_tree(build_elements(head_commit), base_tree=head_commit.tree)
+            commit = repo.create_git_commit(message, tree, [head_commit])
+            try:
+                ref.edit(commit.sha)
+                return commit
+            except GithubException as e:
+                # 422 means the update was not a fast-forward: someone pushed in between.
+                if e.status != 422 or attempt == MAX_REF_UPDATE_RETRIES: raise
+                self.log(f"   - ⚠️ Branch '{branch}' moved, retrying commit ({attempt}/{MAX_REF_UPDATE_RETRIES})...")
+
+    # --- Deletion ---
+
+    def delete_path(self, repo_name, remote_path):
+        """Remove a file or a whole directory in one commit; raises FileNotFoundError if it does not exist."""
+        from github import GithubException, InputGitTreeElement
+        remote_path = remote_path.strip("/")
+        repo = self.github_api.get_repo(repo_name)
+        deleted = []
+
+        def build_elements(head_commit):
+            target = self.find_tree_entry(repo, head_commit.tree.sha, remote_path)
+            if target is None:
+                raise FileNotFoundError(remote_path)
+            entries = [(remote_path, target)]
+            if target.type == "tree":
+                self.log("   - It's a directory, reading its tree...")
+                entries = self.walk_git_tree(repo, target.sha, remote_path)
+            # A null sha removes the path from the new tree; empty parent trees disappear with it.
+            leaves = [(path, e) for path, e in entries if e.type != "tree"]
+            deleted[:] = [path for path, _ in leaves]
+            return [InputGitTreeElement(path, e.mode, e.type, sha=None) for path, e in leaves]
+
+        name = os.path.basename(remote_path)
+        try:
+            commit = self._commit_tree_changes(repo, build_elements, f"chore: remove {name}")
+        except GithubException as e:
+            if e.status == 404: raise FileNotFoundError(remote_path) from e
+            raise
+        self._update_tree_index(repo_name, commit.parents[0].sha, commit.sha, {remote_path: None})
+        if len(deleted) == 1 and deleted[0] == remote_path:
+            self.log(f"✅ Successfully deleted file: {remote_path} ({commit.sha[:7]})")
+        else:
+            self.log(f"✅ Successfully deleted folder and its {len(deleted)} files: {remote_path} ({commit.sha[:7]})")
+        return commit
+
+    # --- Git Trees ---
+
+    def find_tree_entry(self, repo, tree_sha, path):
+        """Resolve a path to its GitTreeElement by walking one tree level per path component."""
+        entry = None
+        for name in path.split("/"):
+            if entry is not None:
+                if entry.type != "tree": return None
+                tree_sha = entry.sha
+            entry = next((e for e in repo.get_git_tree(tree_sha).tree if e.path == name), None)
+            if entry is None: return None
+        return entry
+
+    def walk_git_tree(self, repo, tree_sha, prefix=""):
+        """Return (path, GitTreeElement) pairs for everything below a tree.
+
+        Uses a single recursive Trees API call, falling back to walking the
+        subtrees level by level when GitHub truncates the listing.
+        """
+        tree = repo.get_git_tree(tree_sha, recursive=True)
+        if not tree.truncated:
+            return [(f"{prefix}/{e.path}" if prefix else e.path, e) for e in tree.tree]
+        entries = []
+        for e in repo.get_git_tree(tree_sha).tree:
+            path = f"{prefix}/{e.path}" if prefix else e.path
+            entries.append((path, e))
+            if e.type == "tree":
+                entries.extend(self.walk_git_tree(repo, e.sha, path))
+        return entries
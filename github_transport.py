@@ -0,0 +1,144 @@
+"""The HTTP layer under GithubCore: PyGithub connections and the shared HTTP session.
+
+Every request, whether PyGithub's, a raw upload or a streamed download, goes
+through http_session, so connections stay alive across calls, logins and
+threads.
+
+Importing this module pulls in PyGithub and requests, so github_core only
+imports it on the first network action.
+"""
+import threading
+import requests
+from urllib3.util.retry import Retry
+from github import Github
+from github.Requester import HTTPSRequestsConnectionClass, Requester, RequestsResponse
+from github_core import (
+    governed_request, response_cache, API_TIMEOUT, HTTP_POOL_HOSTS, HTTP_POOL_SIZE, HTTP_RETRIES,
+)
+
+
+class CachedResponse:
+    """Stand-in for a 200 response rebuilt from the cache after a 304."""
+
+    def __init__(self, entry, fresh_headers):
+        self.status = 200
+        self.headers = dict(entry["headers"])
+        # Keep the fresh rate-limit and validator headers from the 304
+        self.headers.update({k.lower(): v for k, v in fresh_headers.items()})
+        self._body = entry["body"]
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self):
+        return self._body
+
+
+def make_http_session():
+    """A keep-alive session with a connection pool per host and retries for safe requests only.
+
+    Connection errors and 5xx responses are retried for GET/HEAD, never for
+    writes, which GitHub may already have applied. requests negotiates gzip
+    by default. Rate-limit responses are left to rate_governor.
+    """
+    session = requests.Session()
+    session.auth = Requester.noopAuth  # Never fall back to ~/.netrc credentials
+    retry = Retry(total=HTTP_RETRIES, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                  allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}), raise_on_status=False)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+http_session = make_http_session()
+
+
+def pool_stats():
+    """(connections opened, requests sent) by the pools http_session still holds."""
+    opened = sent = 0
+    for adapter in set(http_session.adapters.values()):  # One adapter serves both schemes
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                sent += pool.num_requests
+    return opened, sent
+
+
+class ThreadSafeHTTPSConnection(HTTPSRequestsConnectionClass):
+    """PyGithub connection that keeps the pending request per thread.
+
+    The stock connection stores the request on the instance between
+    request() and getresponse(), so worker threads sharing one Github
+    object could end up sending each other's requests.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = http_session
+        self._pending = threading.local()
+
+    def close(self):
+        pass  # PyGithub closes connections it replaces; the shared pool stays open
+
+    def request(self, verb, url, input, headers, stream=False):
+        self._pending.args = (verb, url, input, headers)
+
+    def getresponse(self):
+        return self._send(*self._pending.args)
+
+    def _send(self, verb, url, input, headers):
+        r = governed_request(
+            self.session, verb, f"{self.protocol}://{self.host}:{self.port}{url}",
+            headers=headers, data=input, timeout=self.timeout,
+            verify=self.verify, allow_redirects=False,
+        )
+        return RequestsResponse(r)
+
+
+class CachingHTTPSConnection(ThreadSafeHTTPSConnection):
+    """Sends GETs as conditional requests; a 304 is served from the response cache.
+
+    GitHub does not count 304 responses against the rate limit.
+    """
+
+    def getresponse(self):
+        verb, url, input, headers = self._pending.args
+        if verb != "GET":
+            return self._send(verb, url, input, headers)
+
+        entry = response_cache.load(headers, url)
+        conditional = {**headers, **response_cache.validators(entry)} if entry else headers
+        response = self._send(verb, url, input, conditional)
+        if response.status == 304 and entry:
+            response_cache.hit(headers, url)
+            return CachedResponse(entry, response.headers)
+        response_cache.miss()
+        if response.status == 200:
+            response_cache.store(headers, url, response.headers, response.read())
+        return response
+
+
+class CachingHTTPConnection(CachingHTTPSConnection):
+    """Plain-HTTP variant, for API servers on a local network such as benchmarks/mock_github.py."""
+
+    def __init__(self, host, port=None, *args, **kwargs):
+        super().__init__(host, port or 80, *args, **kwargs)
+        self.protocol = "http"
+
+
+def make_github_client(token, base_url=None):
+    """Create a Github client with a thread-safe, caching, rate-governed connection.
+
+    base_url points the client at another API server, e.g. GitHub Enterprise.
+    """
+    # Pacing and rate-limit retries are left to rate_governor instead of PyGithub's fixed delays.
+    options = {"base_url": base_url.rstrip("/")} if base_url else {}
+    github_api = Github(token, timeout=API_TIMEOUT, retry=None,
+                        seconds_between_requests=None, seconds_between_writes=None, **options)
+    # PyGithub has no public hook for this; the class is looked up when a connection is (re)created.
+    github_api.requester._Requester__connectionClass = (
+        CachingHTTPSConnection if github_api.requester.scheme == "https" else CachingHTTPConnection)
+    return github_api